@@ -3,14 +3,56 @@ declare module "@/logic/GenLayerBets" {
     constructor(contractAddress: string, account?: any, studioUrl?: string);
     updateAccount(account: any): void;
     getBets(): Promise<any[]>;
+    getBetParticipants(
+      betId: string,
+      offset?: number,
+      limit?: number
+    ): Promise<{
+      betId: string;
+      usersBets: { [address: string]: string };
+      usersPoints: { [address: string]: number };
+      totalPlayers: number;
+      nextOffset: number | null;
+    }>;
     getPlayerPoints(address: string): Promise<number>;
-    getLeaderboard(): Promise<Array<{ address: string; points: number }>>;
+    getLeaderboard(
+      offset?: number,
+      limit?: number
+    ): Promise<{
+      entries: Array<{ address: string; points: number; rank: number }>;
+      totalPlayers: number;
+      nextOffset: number | null;
+      stale: boolean;
+    }>;
+    getPlayerRank(address: string): Promise<number>;
+    getStateChunk(
+      cursor?: number,
+      maxItems?: number
+    ): Promise<{
+      bets: any[][];
+      players: string[][];
+      nextCursor: number | null;
+      totalItems: number;
+      chunkDigest: string;
+      stateDigest: string;
+      stateSeq: number;
+    }>;
     placeBets(
       userDiscordHandler: string,
       userXHandler: string,
       betOutcomes: { [key: string]: string }
     ): Promise<any>;
+    placeBetsV2(
+      userDiscordHandler: string,
+      userXHandler: string,
+      outcomes: string | Array<string | null>
+    ): Promise<any>;
+    importUserBets(
+      records: Array<[string, string, string, string]>,
+      skipInvalid?: boolean
+    ): Promise<any>;
     getAllUserBets(address?: string | null): Promise<any>;
+    getUserBets(address: string): Promise<any>;
     getOwner(): Promise<string>;
   }
 }
@@ -1,6 +1,32 @@
 import { createClient } from "genlayer-js";
 import { studionet } from "genlayer-js/chains";
 
+// Convert Map responses (and nested Maps) to regular objects
+const convertMapToObject = (mapObj) => {
+  if (!(mapObj instanceof Map)) {
+    return mapObj;
+  }
+
+  const result = {};
+  mapObj.forEach((value, key) => {
+    if (value instanceof Map) {
+      result[key] = convertMapToObject(value);
+    } else if (Array.isArray(value)) {
+      result[key] = value.map(item => {
+        if (item instanceof Map) {
+          return convertMapToObject(item);
+        }
+        return item;
+      });
+    } else if (typeof value === 'bigint') {
+      result[key] = Number(value);
+    } else {
+      result[key] = value;
+    }
+  });
+  return result;
+};
+
 class GenLayerBets {
   contractAddress;
   client;
@@ -22,7 +48,7 @@ class GenLayerBets {
   async getBets() {
     const bets = await this.client.readContract({
       address: this.contractAddress,
-      functionName: "get_bets",
+      functionName: "get_bets_summary",
       args: [],
     });
     
@@ -40,6 +66,26 @@ class GenLayerBets {
     return bets;
   }
 
+  async getBetParticipants(betId, offset = 0, limit = 100) {
+    const page = await this.client.readContract({
+      address: this.contractAddress,
+      functionName: "get_bet_participants",
+      args: [betId, offset, limit],
+    });
+    return {
+      betId: page.get("bet_id"),
+      usersBets: Object.fromEntries(page.get("users_bets")),
+      usersPoints: Object.fromEntries(
+        Array.from(page.get("users_points").entries()).map(([address, points]) => [
+          address,
+          Number(points),
+        ])
+      ),
+      totalPlayers: Number(page.get("total_players")),
+      nextOffset: page.get("next_offset") == null ? null : Number(page.get("next_offset")),
+    };
+  }
+
   async getPlayerPoints(address) {
     if (!address) {
       return 0;
@@ -52,18 +98,52 @@ class GenLayerBets {
     return points;
   }
 
-  async getLeaderboard() {
-    const points = await this.client.readContract({
+  async getLeaderboard(offset = 0, limit = 100) {
+    const page = await this.client.readContract({
       address: this.contractAddress,
-      functionName: "get_points",
-      args: [],
+      functionName: "get_leaderboard",
+      args: [offset, limit],
     });
-    return Array.from(points.entries())
-      .map(([address, points]) => ({
-        address,
-        points: Number(points),
-      }))
-      .sort((a, b) => b.points - a.points);
+    return {
+      entries: page.get("entries").map((entry) => ({
+        address: entry.get("address"),
+        points: Number(entry.get("points")),
+        rank: Number(entry.get("rank")),
+      })),
+      totalPlayers: Number(page.get("total_players")),
+      nextOffset: page.get("next_offset") == null ? null : Number(page.get("next_offset")),
+      stale: Boolean(page.get("stale")),
+    };
+  }
+
+  async getPlayerRank(address) {
+    if (!address) {
+      return 0;
+    }
+    const rank = await this.client.readContract({
+      address: this.contractAddress,
+      functionName: "get_rank",
+      args: [address],
+    });
+    // A stale rank misses resolved bets whose scores are still being applied
+    return Number(rank.get("rank"));
+  }
+
+  async getStateChunk(cursor = 0, maxItems = 200) {
+    const chunk = await this.client.readContract({
+      address: this.contractAddress,
+      functionName: "get_state_chunk",
+      args: [cursor, maxItems],
+    });
+    return {
+      bets: chunk.get("bets"),
+      players: chunk.get("players"),
+      nextCursor: chunk.get("next_cursor") == null ? null : Number(chunk.get("next_cursor")),
+      totalItems: Number(chunk.get("total_items")),
+      chunkDigest: chunk.get("chunk_digest"),
+      stateDigest: chunk.get("state_digest"),
+      stateSeq: Number(chunk.get("state_seq")),
+    };
   }
 
   // async createBet(betId, resolutionDate, resolutionUrl, title, description, category) {
@@ -109,71 +189,82 @@ class GenLayerBets {
     return receipt;
   }
 
+  // outcomes is either a compact string ("yn-y") or an array of "yes"/"no"/null,
+  // one entry per bet in creation order
+  async placeBetsV2(userDiscordHandler, userXHandler, outcomes) {
+    const packedOutcomes = Array.isArray(outcomes)
+      ? outcomes.map((outcome) => (outcome ? outcome[0].toLowerCase() : "-")).join("")
+      : outcomes;
+    const txHash = await this.client.writeContract({
+      address: this.contractAddress,
+      functionName: "place_bets_v2",
+      args: [userDiscordHandler, userXHandler, packedOutcomes],
+    });
+    const receipt = await this.client.waitForTransactionReceipt({
+      hash: txHash,
+      status: "FINALIZED",
+      interval: 10000,
+    });
+    return receipt;
+  }
+
+  // Owner only: registers players collected off-chain, records are
+  // [address, discordHandle, xHandle, outcomes] in the placeBetsV2 format
+  async importUserBets(records, skipInvalid = false) {
+    const txHash = await this.client.writeContract({
+      address: this.contractAddress,
+      functionName: "import_user_bets",
+      args: [records, skipInvalid],
+    });
+    const receipt = await this.client.waitForTransactionReceipt({
+      hash: txHash,
+      status: "FINALIZED",
+      interval: 10000,
+    });
+    return receipt;
+  }
+
   async getAllUserBets(address = undefined) {
+    // A single player's data is read with the per-address view
+    if (address && typeof address === 'string') {
+      return this.getUserBets(address);
+    }
+
     const userBets = await this.client.readContract({
       address: this.contractAddress,
       functionName: "get_all_user_bets",
       args: [],
     });
-    
-    // Convert the entire Map response to a regular object
-    const convertMapToObject = (mapObj) => {
-      if (!(mapObj instanceof Map)) {
-        return mapObj;
-      }
-      
-      const result = {};
-      mapObj.forEach((value, key) => {
-        if (value instanceof Map) {
-          result[key] = convertMapToObject(value);
-        } else if (Array.isArray(value)) {
-          result[key] = value.map(item => {
-            if (item instanceof Map) {
-              return convertMapToObject(item);
-            }
-            return item;
-          });
-        } else if (typeof value === 'bigint') {
-          result[key] = Number(value);
-        } else {
-          result[key] = value;
-        }
-      });
-      return result;
+
+    return convertMapToObject(userBets);
+  }
+
+  async getUserBets(address) {
+    const userBets = await this.client.readContract({
+      address: this.contractAddress,
+      functionName: "get_user_bets",
+      args: [address],
+    });
+
+    const filteredUserBets = {
+      total_users: 1,
+      user_addresses: [],
+      user_bet_selections: {},
+      user_handlers: {}
     };
-    
-    // Convert the entire response
-    const convertedUserBets = convertMapToObject(userBets);
-    
-    // If address is provided, filter for that specific user
-    if (address && typeof address === 'string') {
-      const userAddress = address.toLowerCase();
-      const filteredUserBets = {
-        total_users: 1,
-        user_addresses: convertedUserBets.user_addresses,
-        user_bet_selections: {},
-        user_handlers: {}
-      };
-      
-      // Find the user's data
-      if (convertedUserBets.user_addresses) {
-        const userIndex = convertedUserBets.user_addresses.findIndex(
-          addr => addr.toLowerCase() === userAddress
-        );
-        
-        if (userIndex !== -1) {
-          const userAddr = convertedUserBets.user_addresses[userIndex];
-          filteredUserBets.user_bet_selections = 
-            convertedUserBets.user_bet_selections[userAddr] || {};
-          filteredUserBets.user_handlers = 
-            convertedUserBets.user_handlers[userAddr] || {};
-        }
-      }
-      
+    if (!userBets) {
       return filteredUserBets;
     }
-    
-    return convertedUserBets;
+
+    const player = convertMapToObject(userBets);
+    filteredUserBets.user_addresses = [player.address];
+    filteredUserBets.user_bet_selections = player.bet_selections;
+    filteredUserBets.user_handlers = {
+      x_handler: player.x_handler,
+      discord_handler: player.discord_handler,
+    };
+    filteredUserBets.points = player.points;
+    return filteredUserBets;
   }
 
   async getOwner() {
@@ -0,0 +1,154 @@
+"""
+Scaling benchmark for the GenLayerBets contract.
+
+Runs the contract in-process on the `genlayer` simulator with a growing
+number of players and reports, per method, wall time, storage reads and
+writes and the response size. Response bytes are the length of the compact
+JSON encoding of the return value, a stand-in for the calldata size.
+
+Usage:
+    python -m bench.benchmark_contract --players 1000 10000 100000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+
+from bench import genlayer_sim
+
+# Enough markets for nearly every player to have a distinct pick mask
+BET_COUNT = 40
+IMPORT_BATCH = 100
+# Players moved up the leaderboard per `apply_scores` call
+SCORE_PAGE = 500
+OWNER = "0x1"
+# bet_0 closes first and is resolved while the other markets still take picks
+OPEN_TIME = 1704067200  # 2024-01-01
+BET_0_CLOSED_TIME = 1738368000  # 2025-02-01
+
+
+def player_address(index: int) -> str:
+    return hex(0x1000 + index)
+
+
+def setup_contract(contracts, players: int, rng: random.Random):
+    genlayer_sim.reset()
+    genlayer_sim.set_time(OPEN_TIME)
+    genlayer_sim.set_webpage("https://example.com/resolution", "The answer is yes")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "Simulated"}'
+    )
+    contract = contracts.GenLayerBets()
+    for i in range(BET_COUNT):
+        contract.create_bet(
+            f"bet_{i}",
+            "2025-01-01" if i == 0 else "2025-07-01",
+            "https://example.com/resolution",
+            "",
+            "",
+            f"Bet {i}",
+            "Benchmark bet",
+            "Benchmark",
+        )
+    for i in range(players):
+        genlayer_sim.set_sender(player_address(i))
+        outcomes = "".join(rng.choice("yn") for _ in range(BET_COUNT))
+        contract.place_bets_v2(f"discord_{i}", f"x_{i}", outcomes)
+    genlayer_sim.set_sender(OWNER)
+    return contract
+
+
+def measure(name: str, call) -> dict:
+    genlayer_sim.stats.reset()
+    # Keep the contract's own prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - started
+    response = json.dumps(result, separators=(",", ":"), default=str)
+    return {
+        "method": name,
+        "seconds": elapsed,
+        **genlayer_sim.stats.snapshot(),
+        "response_bytes": len(response.encode()),
+    }
+
+
+def run_benchmark(contracts, players: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    contract = setup_contract(contracts, players, rng)
+    sample = player_address(players // 2)
+    # Later picks skip bet_0, which is resolved first
+    open_outcomes = "-" + "y" * (BET_COUNT - 1)
+
+    genlayer_sim.set_time(BET_0_CLOSED_TIME)
+    results = [
+        measure("get_bets", contract.get_bets),
+        measure("get_bets_summary", contract.get_bets_summary),
+        measure("get_all_user_bets", contract.get_all_user_bets),
+        measure("get_user_bets", lambda: contract.get_user_bets(sample)),
+        measure("resolve_bet", lambda: contract.resolve_bet("bet_0")),
+        measure("apply_scores", lambda: contract.apply_scores("bet_0", SCORE_PAGE)),
+        measure("get_points", contract.get_points),
+        measure("get_leaderboard", lambda: contract.get_leaderboard(0, 100)),
+        measure("get_rank", lambda: contract.get_rank(sample)),
+        measure("get_metrics", contract.get_metrics),
+        measure(
+            "import_user_bets",
+            lambda: contract.import_user_bets(
+                [
+                    [player_address(players + 1 + i), f"imported_{i}", "", open_outcomes]
+                    for i in range(IMPORT_BATCH)
+                ]
+            ),
+        ),
+    ]
+
+    genlayer_sim.set_sender(player_address(players))
+    results.append(
+        measure(
+            "place_bets_v2",
+            lambda: contract.place_bets_v2("discord_new", "x_new", open_outcomes),
+        )
+    )
+    for result in results:
+        result["players"] = players
+    return results
+
+
+def format_report(results: list[dict]) -> str:
+    header = (
+        f"{'players':>8} {'method':<18} {'seconds':>10} {'reads':>10} "
+        f"{'writes':>8} {'bytes':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['players']:>8} {result['method']:<18} "
+            f"{result['seconds']:>10.4f} {result['reads']:>10} "
+            f"{result['writes']:>8} {result['response_bytes']:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON rows")
+    args = parser.parse_args()
+
+    contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+    results = []
+    for players in args.players:
+        results.extend(run_benchmark(contracts, players, args.seed))
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+
+if __name__ == "__main__":
+    main()
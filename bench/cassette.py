@@ -0,0 +1,175 @@
+"""
+Record/replay cassettes for the non-deterministic calls of a contract.
+
+Wraps `gl.get_webpage`, `gl.exec_prompt` and the contract's `request_to_x`
+while the contract runs on the `genlayer` simulator. Recording fetches
+webpages and X requests live and asks a real LLM, then saves every answer
+in a JSON cassette keyed by URL, X request or prompt hash. Replaying serves
+the saved answers and never touches the network.
+
+A cassette records when its file does not exist yet or when
+`GENLAYER_RECORD_CASSETTES=1` is set, and replays otherwise.
+
+Usage:
+    with Cassette("test/cassettes/genlayer_bets.json").install(contracts):
+        contract.resolve_bet("bet_id")
+"""
+
+import contextlib
+import hashlib
+import html
+import json
+import os
+import re
+import types
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable
+
+from bench import genlayer_sim
+
+SECTIONS = ("webpages", "x_requests", "prompts")
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def live_fetch(url: str, mode: str = "text") -> str:
+    """
+    Fetches a webpage, reducing HTML to its visible text in "text" mode
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": "genlayer-bets"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        content = response.read().decode("utf-8", errors="replace")
+        content_type = response.headers.get("Content-Type", "")
+    if mode != "text" or "html" not in content_type:
+        return content
+    content = re.sub(r"(?is)<(script|style)\b.*?</\1>", " ", content)
+    content = re.sub(r"(?s)<[^>]+>", " ", content)
+    return re.sub(r"\s+", " ", html.unescape(content)).strip()
+
+
+def live_prompt(prompt: str) -> str:
+    """
+    Asks an OpenAI compatible chat completions endpoint, configured with
+    `OPENAI_API_KEY`, `OPENAI_BASE_URL` and `OPENAI_MODEL`
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise CassetteMiss("OPENAI_API_KEY must be set to record prompts")
+    base_url = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+    body = json.dumps(
+        {
+            "model": os.environ.get("OPENAI_MODEL", "gpt-4o-mini"),
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0,
+        }
+    ).encode()
+    request = urllib.request.Request(
+        f"{base_url}/chat/completions",
+        data=body,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+    )
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return json.load(response)["choices"][0]["message"]["content"]
+
+
+def x_request_key(endpoint: str, params: dict) -> str:
+    return f"{endpoint}?{urllib.parse.urlencode(sorted(params.items()))}"
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+class Cassette:
+    def __init__(
+        self,
+        path: str | Path,
+        record: bool | None = None,
+        fetch: Callable[[str, str], str] = live_fetch,
+        prompt: Callable[[str], str] = live_prompt,
+    ):
+        self.path = Path(path)
+        if record is None:
+            record = (
+                os.environ.get("GENLAYER_RECORD_CASSETTES") == "1"
+                or not self.path.exists()
+            )
+        self.record = record
+        self.fetch = fetch
+        self.prompt = prompt
+        self.entries = {section: {} for section in SECTIONS}
+        if self.path.exists():
+            self.entries.update(json.loads(self.path.read_text()))
+        self._in_x_request = False
+
+    def _lookup(self, section: str, key: str, call: Callable[[], Any]) -> Any:
+        entries = self.entries[section]
+        if key in entries:
+            return entries[key]
+        if not self.record:
+            raise CassetteMiss(
+                f"No recorded {section} entry {key} in {self.path}, rerun with "
+                "GENLAYER_RECORD_CASSETTES=1 to record it"
+            )
+        entries[key] = call()
+        return entries[key]
+
+    def get_webpage(self, url: str, mode: str = "text") -> str:
+        if self._in_x_request:
+            # Recorded as a whole under `x_requests`
+            return self.fetch(url, mode)
+        return self._lookup("webpages", url, lambda: self.fetch(url, mode))
+
+    def exec_prompt(self, prompt: str) -> str:
+        return self._lookup("prompts", prompt_key(prompt), lambda: self.prompt(prompt))
+
+    def wrap_request_to_x(self, request_to_x: Callable) -> Callable:
+        def recorded_request_to_x(endpoint, params, cache=None):
+            key = x_request_key(endpoint, params)
+
+            def call():
+                self._in_x_request = True
+                try:
+                    return request_to_x(endpoint, params)
+                finally:
+                    self._in_x_request = False
+
+            def fetch():
+                return self._lookup("x_requests", key, call)
+
+            return fetch() if cache is None else cache.get(key, fetch)
+
+        return recorded_request_to_x
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            # Key order is kept, X payloads are replayed exactly as recorded
+            json.dumps(self.entries, indent=2, ensure_ascii=False)
+            + "\n"
+        )
+
+    @contextlib.contextmanager
+    def install(self, contract_module: types.ModuleType):
+        """
+        Routes the simulator's non-deterministic calls and the contract's X
+        requests through the cassette, saving new recordings on exit
+        """
+        gl = genlayer_sim.gl
+        originals = (gl.get_webpage, gl.exec_prompt, contract_module.request_to_x)
+        gl.get_webpage = self.get_webpage
+        gl.exec_prompt = self.exec_prompt
+        contract_module.request_to_x = self.wrap_request_to_x(originals[2])
+        try:
+            yield self
+        finally:
+            gl.get_webpage, gl.exec_prompt, contract_module.request_to_x = originals
+            if self.record:
+                self.save()
@@ -0,0 +1,358 @@
+"""
+Pure-Python stand-in for the `genlayer` module.
+
+Runs intelligent contracts in-process, without a GenLayer studio. Storage
+containers and records count their reads and writes in `stats`, webpages and
+LLM answers come from `set_webpage` and `set_prompt_handler`, the contract's
+clock can be pinned with `set_time`, and equivalence principles simply run
+the leader function.
+
+Counting rules: every scalar contract field access, container element access,
+container length and record field access of a stored record is one storage
+op. Storing a record writes each of its fields, building a record in memory
+is free.
+
+Usage:
+    from bench import genlayer_sim
+    contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+    contract = contracts.GenLayerBets()
+"""
+
+import dataclasses
+import importlib
+import sys
+import types
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+
+@dataclass
+class StorageStats:
+    reads: int = 0
+    writes: int = 0
+
+    def reset(self) -> None:
+        self.reads = 0
+        self.writes = 0
+
+    def snapshot(self) -> dict:
+        return {"reads": self.reads, "writes": self.writes}
+
+
+stats = StorageStats()
+
+
+class Address:
+    def __init__(self, value: "str | bytes | Address"):
+        if isinstance(value, Address):
+            value = value.as_hex
+        if isinstance(value, bytes):
+            value = value.hex()
+        digits = value.lower().removeprefix("0x")
+        if len(digits) > 40 or any(c not in "0123456789abcdef" for c in digits):
+            raise ValueError(f"Invalid address: {value}")
+        self.as_hex = "0x" + digits.rjust(40, "0")
+
+    @property
+    def as_bytes(self) -> bytes:
+        return bytes.fromhex(self.as_hex[2:])
+
+    def __eq__(self, other):
+        return isinstance(other, Address) and other.as_hex == self.as_hex
+
+    def __lt__(self, other):
+        return self.as_hex < other.as_hex
+
+    def __hash__(self):
+        return hash(self.as_hex)
+
+    def __repr__(self):
+        return f"Address({self.as_hex})"
+
+
+u256 = u64 = u32 = bigint = int
+
+
+def _is_record(value: Any) -> bool:
+    return getattr(type(value), "__sim_storage__", False)
+
+
+def _store(value: Any) -> Any:
+    # Writing a record into storage writes each of its fields, and a list
+    # becomes a storage array like it does on GenLayer
+    if _is_record(value):
+        object.__setattr__(value, "__sim_stored__", True)
+        stats.writes += len(dataclasses.fields(value))
+    else:
+        stats.writes += 1
+    if type(value) is list:
+        return DynArray(value)
+    return value
+
+
+class TreeMap(dict):
+    def __class_getitem__(cls, params):
+        return cls
+
+    def __getitem__(self, key):
+        stats.reads += 1
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        stats.reads += 1
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        stats.reads += 1
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _store(value))
+
+    def __delitem__(self, key):
+        stats.writes += 1
+        super().__delitem__(key)
+
+    def __len__(self):
+        stats.reads += 1
+        return super().__len__()
+
+    def __iter__(self):
+        for key in super().__iter__():
+            stats.reads += 1
+            yield key
+
+    def keys(self):
+        return list(iter(self))
+
+    def items(self):
+        return [(key, super(TreeMap, self).__getitem__(key)) for key in self]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+
+class DynArray(list):
+    def __class_getitem__(cls, params):
+        return cls
+
+    def __getitem__(self, index):
+        value = super().__getitem__(index)
+        stats.reads += len(value) if isinstance(index, slice) else 1
+        return value
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, _store(value))
+
+    def __len__(self):
+        stats.reads += 1
+        return super().__len__()
+
+    def __iter__(self):
+        for value in super().__iter__():
+            stats.reads += 1
+            yield value
+
+    def append(self, value):
+        super().append(_store(value))
+
+    def insert(self, index, value):
+        # Every element after `index` moves one slot
+        stats.writes += max(super().__len__() - index, 0)
+        super().insert(index, _store(value))
+
+    def pop(self, index=-1):
+        stats.writes += 1
+        return super().pop(index)
+
+
+def allow_storage(cls):
+    """
+    Marks a dataclass as a storage record whose field accesses are counted
+    once the record is stored
+    """
+    field_names = {field.name for field in dataclasses.fields(cls)}
+
+    def __getattribute__(self, name):
+        if name in field_names and object.__getattribute__(
+            self, "__dict__"
+        ).get("__sim_stored__"):
+            stats.reads += 1
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name in field_names and self.__dict__.get("__sim_stored__"):
+            stats.writes += 1
+        object.__setattr__(self, name, value)
+
+    cls.__getattribute__ = __getattribute__
+    cls.__setattr__ = __setattr__
+    cls.__sim_storage__ = True
+    return cls
+
+
+def _default(annotation: Any) -> Any:
+    if isinstance(annotation, type):
+        if issubclass(annotation, (TreeMap, DynArray, int, str, bool)):
+            return annotation()
+        if annotation is Address:
+            return Address("0x0")
+    return None
+
+
+class Contract:
+    """
+    Base class of simulated contracts: storage fields start at their zero
+    value and scalar field accesses are counted
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        annotations = cls.__dict__.get("__annotations__", {})
+        cls.__sim_scalars__ = {
+            name
+            for name, annotation in annotations.items()
+            if not (
+                isinstance(annotation, type)
+                and issubclass(annotation, (TreeMap, DynArray))
+            )
+        }
+        init = cls.__init__
+
+        def __init__(self, *args, **kwargs):
+            for name, annotation in annotations.items():
+                object.__setattr__(self, name, _default(annotation))
+            init(self, *args, **kwargs)
+
+        cls.__init__ = __init__
+
+    def __getattribute__(self, name):
+        if name in type(self).__dict__.get("__sim_scalars__", ()):
+            stats.reads += 1
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name in type(self).__sim_scalars__:
+            stats.writes += 1
+        object.__setattr__(self, name, value)
+
+
+class _Public:
+    @staticmethod
+    def view(function):
+        return function
+
+    class write:
+        def __new__(cls, function):
+            return function
+
+        @staticmethod
+        def payable(function):
+            return function
+
+
+_webpages: dict[str, str] = {}
+_prompt_handler: Callable[[str], str] = lambda prompt: ""
+_now: float | None = None
+
+
+class _SimDatetime(datetime):
+    # Installed as the contract's `datetime`, reads the time set by `set_time`
+    @classmethod
+    def now(cls, tz=None):
+        if _now is None:
+            return super().now(tz)
+        return cls.fromtimestamp(_now, tz)
+
+
+def set_webpage(url: str, content: str) -> None:
+    _webpages[url] = content
+
+
+def set_prompt_handler(handler: Callable[[str], str]) -> None:
+    global _prompt_handler
+    _prompt_handler = handler
+
+
+def set_sender(address: "str | Address") -> None:
+    gl.message.sender_address = Address(address)
+
+
+def set_time(timestamp: float | None) -> None:
+    """
+    Pins the contract's clock to epoch seconds, None follows the real clock
+    """
+    global _now
+    _now = timestamp
+
+
+def reset() -> None:
+    """
+    Clears the webpages, prompt handler, sender, clock and counters
+    """
+    _webpages.clear()
+    set_prompt_handler(lambda prompt: "")
+    set_sender("0x1")
+    set_time(None)
+    stats.reset()
+
+
+def _get_webpage(url: str, mode: str = "text") -> str:
+    if url not in _webpages:
+        raise Exception(f"No simulated webpage for {url}")
+    return _webpages[url]
+
+
+def _exec_prompt(prompt: str) -> str:
+    return _prompt_handler(prompt)
+
+
+class _Return:
+    def __init__(self, calldata: Any):
+        self.calldata = calldata
+
+
+def _run_nondet(leader_fn: Callable[[], Any], validator_fn: Callable) -> Any:
+    result = leader_fn()
+    if not validator_fn(_Return(result)):
+        raise Exception("Validator disagreed with the leader")
+    return result
+
+
+gl = types.SimpleNamespace(
+    Contract=Contract,
+    public=_Public,
+    message=types.SimpleNamespace(sender_address=Address("0x1")),
+    get_webpage=lambda url, mode="text": _get_webpage(url, mode),
+    exec_prompt=lambda prompt: _exec_prompt(prompt),
+    eq_principle_strict_eq=lambda function: function(),
+    eq_principle_prompt_comparative=lambda function, principle: function(),
+    eq_principle_prompt_non_comparative=lambda function, task, criteria: function(),
+    vm=types.SimpleNamespace(
+        run_nondet=_run_nondet, Return=_Return, Result=_Return
+    ),
+)
+
+__all__ = [
+    "gl",
+    "Address",
+    "TreeMap",
+    "DynArray",
+    "u256",
+    "u64",
+    "u32",
+    "bigint",
+    "allow_storage",
+]
+
+
+def load_contract(module_name: str) -> types.ModuleType:
+    """
+    Imports a contract module with this simulator installed as `genlayer`
+    """
+    sys.modules["genlayer"] = sys.modules[__name__]
+    module = importlib.import_module(module_name)
+    if getattr(module, "datetime", None) is datetime:
+        module.datetime = _SimDatetime
+    return module
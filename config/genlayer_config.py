@@ -10,5 +10,12 @@ def get_config() -> dict:
         "rpc_protocol": os.environ["RPCPROTOCOL"],
         "rpc_host": os.environ["RPCHOST"],
         "rpc_port": os.environ["RPCPORT"],
+        # Only needed by the off-chain services
+        "contract_address": os.environ.get("CONTRACT_ADDRESS", ""),
+        "private_key": os.environ.get("PRIVATE_KEY", ""),
     }
     return config
+
+
+def get_rpc_url(config: dict) -> str:
+    return f"{config['rpc_protocol']}://{config['rpc_host']}:{config['rpc_port']}/api"
@@ -1,18 +1,105 @@
 # { "Depends": "py-genlayer:test" }
 
+import contextlib
+import hashlib
 import json
+import operator
+import re
+import time
 import typing
 import urllib.parse
 from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
 from genlayer import *
 from datetime import datetime, timezone
 
+# Player picks are packed into a single u256 per address: bit `i` holds the
+# pick for bet `i` (1 = "yes") and bit `MAX_BETS + i` marks participation.
+MAX_BETS = 128
+PICKS_MASK = (1 << MAX_BETS) - 1
+
+VALID_OUTCOMES = ("yes", "no")
+
+# Characters of the compact outcome string accepted by `place_bets_v2`
+PACKED_OUTCOMES = {"y": "yes", "n": "no"}
+SKIPPED_OUTCOME = "-"
+
+# Entry keys of `create_bets`, in `create_bet` argument order
+CREATE_BET_FIELDS = (
+    "bet_id",
+    "resolution_date",
+    "resolution_url",
+    "resolution_x_method",
+    "resolution_x_parameter",
+    "title",
+    "description",
+    "category",
+)
+CREATE_BET_REQUIRED_FIELDS = ("bet_id", "resolution_date", "title", "description")
+
+# Upper bound for the page size of paginated views
+MAX_PAGE_SIZE = 500
+
+# Web content passed to the resolution prompt is cut into windows and only the
+# windows most relevant to the bet are kept, up to the bet's character budget
+CONTENT_WINDOW_SIZE = 1000
+CONTENT_WINDOW_SEPARATOR = "\n[...]\n"
+DEFAULT_CONTENT_BUDGET = 8000
+MAX_CONTENT_BUDGET = 64000
+# Comparators of deterministic resolution rules, see `set_bet_rule`
+RULE_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Number of change records kept for `get_changes_since`
+CHANGE_LOG_CAPACITY = 256
+
+# Fields of the X API payloads that markets can be resolved from
+X_TWEET_FIELDS = ("id", "text", "created_at", "public_metrics")
+X_ERROR_FIELDS = ("title", "detail")
+
+# Tuple encoding of bets and players in `get_state_chunk`
+BET_TUPLE_FIELDS = (
+    "id",
+    "resolution_timestamp",
+    "has_resolved",
+    "resolution_url",
+    "resolution_x_method",
+    "resolution_x_parameter",
+    "title",
+    "description",
+    "category",
+    "outcome",
+    "reason",
+)
+PLAYER_TUPLE_FIELDS = ("address", "discord_handler", "x_handler", "picks")
+STATE_DIGEST_MODULUS = 1 << 256
+
+# Resolution modes of bets without a rule: "prompt" compares full
+# classifications across validators, "evidence" has validators check the
+# leader's verdict against a short excerpt of the source
+RESOLUTION_MODES = ("prompt", "evidence")
+EVIDENCE_MAX_CHARS = 300
+
+# Logged string values are cut to this many characters, see `log_event`
+LOG_VALUE_LIMIT = 200
+
+STOPWORDS = set(
+    "and any are but for from has have more not one than that the this until "
+    "was what when which who will with".split()
+)
+
 
 @allow_storage
 @dataclass
 class Bet:
     id: str
-    resolution_date: str
+    resolution_timestamp: u64  # Epoch seconds of the resolution date (UTC)
     has_resolved: bool
     resolution_url: str
     resolution_x_method: str
@@ -24,23 +111,122 @@ class Bet:
     category: str
     outcome: str
     reason: str
+    content_budget: u32  # Max characters of web content in the prompt
+    # Optional deterministic resolution rule, see `set_bet_rule`
+    rule_path: str
+    rule_comparator: str
+    rule_threshold: str
+    resolution_mode: str  # See `set_bet_resolution_mode`, "" means "prompt"
+
+
+@allow_storage
+@dataclass
+class ChangeRecord:
+    seq: u64
+    kind: str  # bet_created, bet_resolved, player_registered or points_changed
+    subject: str  # Bet id or player address
+    detail: str
+
+
+@allow_storage
+@dataclass
+class Player:
+    discord_handler: str
+    x_handler: str
+    picks: u256  # Packed picks, see `MAX_BETS`. Points are derived from them.
+    score: u32  # Points already counted in the leaderboard, see `apply_scores`
 
 
 class GenLayerBets(gl.Contract):
     bets: DynArray[Bet]
-    x_handlers: TreeMap[Address, str]
-    discord_handlers: TreeMap[Address, str]
-    user_bets: TreeMap[Address, DynArray[str]]
-    overall_points: TreeMap[Address, u256]
+    bet_index: TreeMap[str, u32]  # Bet id -> position in `bets`
+    resolved_mask: u256  # Bit `i` set once bet `i` resolved to "yes" or "no"
+    outcome_mask: u256  # Bit `i` set when bet `i` resolved to "yes"
+    player_addresses: DynArray[Address]  # Registration order, used as cursor
+    # Leaderboard: players by `Player.score`, moved up a bucket by
+    # `apply_scores`. `score_slots` holds the position of each player in its
+    # bucket, `scored_mask` has bit `i` set once bet `i` is fully applied and
+    # `score_cursors` holds the next player position of bets being applied.
+    score_members: TreeMap[u32, DynArray[Address]]
+    score_slots: TreeMap[Address, u32]
+    scored_mask: u256
+    score_cursors: TreeMap[u32, u32]
+    # Bet positions by resolution date: entries before `due_head` are all
+    # resolved and the entries from `due_head` on are kept in date order
+    due_bets: DynArray[u32]
+    due_head: u32
+    # Change feed: `state_seq` grows on every change and the last
+    # `CHANGE_LOG_CAPACITY` records are kept in a ring buffer
+    state_seq: u64
+    change_log: DynArray[ChangeRecord]
     owner: Address
+    players: TreeMap[Address, Player]
+    # Reverse indexes keyed by normalized handle, see `normalize_handle`
+    discord_index: TreeMap[str, Address]
+    x_index: TreeMap[str, Address]
+    # Sum of `state_item_digest` over every bet and player tuple, modulo
+    # `STATE_DIGEST_MODULUS`, updated whenever a tuple changes
+    state_digest: u256
+    # Persistent counters of the write methods, see `get_metrics`
+    metrics: TreeMap[str, u64]
+    # Whether the owner can still copy a season in progress, see
+    # `migrate_user_bets`
+    migration_open: bool
 
     def __init__(self):
         self.owner = gl.message.sender_address
+        self.migration_open = True
 
     def _require_owner(self):
         if gl.message.sender_address != self.owner:
             raise Exception("Only the contract owner can call this method")
 
+    def _get_bet_index(self, bet_id: str) -> int:
+        if bet_id not in self.bet_index:
+            raise Exception(f"Bet with id {bet_id} not found")
+        return self.bet_index[bet_id]
+
+    def _count_points(self, user_mask: int, resolved_mask: int | None = None) -> int:
+        # A pick scores when its bet resolved, the player took part in it and
+        # the pick bit matches the outcome bit.
+        if resolved_mask is None:
+            resolved_mask = self.resolved_mask
+        participation = user_mask >> MAX_BETS
+        matches = ~(user_mask ^ self.outcome_mask) & PICKS_MASK
+        return (matches & participation & resolved_mask).bit_count()
+
+    def _scores_stale(self) -> bool:
+        # Some resolved bet is not applied to the leaderboard yet
+        return self.resolved_mask & ~self.scored_mask != 0
+
+    def _top_points(self) -> int:
+        # No player can have more points than there are resolved bets
+        return self.resolved_mask.bit_count()
+
+    def _add_score(self, user_address: Address, points: int) -> None:
+        if points not in self.score_members:
+            self.score_members[points] = []
+        bucket = self.score_members[points]
+        self.score_slots[user_address] = len(bucket)
+        bucket.append(user_address)
+
+    def _raise_score(self, user_address: Address, player: Player) -> None:
+        # Swap the last player of the bucket into the freed slot
+        bucket = self.score_members[player.score]
+        slot = self.score_slots[user_address]
+        last_address = bucket[len(bucket) - 1]
+        bucket[slot] = last_address
+        self.score_slots[last_address] = slot
+        bucket.pop()
+        player.score += 1
+        self._add_score(user_address, player.score)
+
+    def _check_page(self, offset: int, limit: int) -> None:
+        if offset < 0:
+            raise Exception("Offset must not be negative")
+        if limit <= 0 or limit > MAX_PAGE_SIZE:
+            raise Exception(f"Limit must be between 1 and {MAX_PAGE_SIZE}")
+
     @gl.public.write
     def create_bet(
         self,
@@ -58,7 +244,7 @@ class GenLayerBets(gl.Contract):
 
         Args:
             bet_id: Unique identifier for the bet
-            date: Date when the bet can be resolved (YYYY-MM-DD format)
+            resolution_date: Date when the bet can be resolved (YYYY-MM-DD format)
             resolution_url: URL to check for bet resolution
             resolution_x_method: X API method to use for resolution (if no URL)
             resolution_x_parameter: Parameter for X API method (user handle, tweet ID, etc.)
@@ -66,191 +252,745 @@ class GenLayerBets(gl.Contract):
             description: Description of what is being bet on
         """
         self._require_owner()
+        self._count("create_bet.calls")
 
         # Check if bet ID already exists
-        existing_bet = next((bet for bet in self.bets if bet.id == bet_id), None)
-        if existing_bet is not None:
+        if bet_id in self.bet_index:
             raise Exception(f"Bet with id {bet_id} already exists")
 
-        # Create the new bet
-        new_bet = Bet(
-            id=bet_id,
-            resolution_date=resolution_date,
-            has_resolved=False,
-            resolution_url=resolution_url,
-            resolution_x_method=resolution_x_method,
-            resolution_x_parameter=resolution_x_parameter,
-            title=title,
-            description=description,
-            category=category,
-            outcome="",  # Default value, will be set when resolved
-            reason="",  # Default value, will be set when resolved
+        if len(self.bets) >= MAX_BETS:
+            raise Exception(f"Cannot create more than {MAX_BETS} bets")
+
+        self._count("bets_created")
+        self._append_bet(
+            _new_bet(
+                bet_id,
+                resolution_date,
+                resolution_url,
+                resolution_x_method,
+                resolution_x_parameter,
+                title,
+                description,
+                category,
+            )
         )
 
-        # Add the bet to the contract
-        self.bets.append(new_bet)
+    @gl.public.write
+    def create_bets(self, bets_json: str, skip_invalid: bool = False) -> dict:
+        """
+        Creates several betting events in a single transaction. Only the
+        contract owner can call this method.
 
-    def _check_bet(self, bet: Bet) -> str:
-        bet_resolution_url = bet.resolution_url
-        bet_resolution_x_method = bet.resolution_x_method
-        bet_resolution_x_parameter = bet.resolution_x_parameter
-        bet_title = bet.title
-        bet_description = bet.description
-
-        def get_bet_result() -> str:
-            # Check if we should use X API method instead of URL
-            if not bet_resolution_url and bet_resolution_x_method:
-                # Use X API method
-                if bet_resolution_x_method == "get_user_latest_tweets":
-                    if not bet_resolution_x_parameter:
-                        raise Exception(
-                            "X API method 'get_user_latest_tweets' requires user handle parameter"
-                        )
-                    tweet_data = get_user_latest_tweets(bet_resolution_x_parameter)
-                    web_data = json.dumps(tweet_data, indent=2)
-                elif bet_resolution_x_method == "get_tweet_data":
-                    if not bet_resolution_x_parameter:
-                        raise Exception(
-                            "X API method 'get_tweet_data' requires tweet ID parameter"
-                        )
-                    tweet_data = get_tweet_data(bet_resolution_x_parameter)
-                    web_data = json.dumps(tweet_data, indent=2)
-                else:
-                    raise Exception(f"Unknown X API method: {bet_resolution_x_method}")
-            else:
-                # Use the original URL-based approach
-                if not bet_resolution_url:
-                    raise Exception("No resolution URL or valid X API method provided")
+        The whole batch is validated first, against the existing bets and
+        within itself. Without `skip_invalid`, any invalid entry aborts the
+        call and no bet is created.
 
-                web_data = gl.get_webpage(bet_resolution_url, mode="text")
+        Args:
+            bets_json: JSON array of objects with the `create_bet` arguments as
+                keys: "bet_id", "resolution_date", "title" and "description"
+                are required, "resolution_url", "resolution_x_method",
+                "resolution_x_parameter" and "category" default to ""
+            skip_invalid: Create the valid entries and report the invalid ones
+                instead of aborting
 
-            task = f"""
-In the following web content, you need to resolve a bet about {bet_title}: {bet_description}
+        Returns:
+            dict: The ids of the created bets and the errors of the skipped
+                entries, each with its position in the batch
+        """
+        self._require_owner()
+        self._count("create_bets.calls")
 
-The possible outcomes are: ["yes", "no"]
+        try:
+            entries = json.loads(bets_json)
+        except json.JSONDecodeError:
+            raise Exception("Bets must be a JSON array")
+        if not isinstance(entries, list) or not entries:
+            raise Exception("Bets must be a non-empty JSON array")
 
-Web content:
-{web_data}
+        new_bets = []
+        batch_ids = set()
+        errors = []
+        for position, entry in enumerate(entries):
+            try:
+                new_bet = _new_bet_from_entry(entry)
+                if new_bet.id in self.bet_index:
+                    raise Exception(f"Bet with id {new_bet.id} already exists")
+                if new_bet.id in batch_ids:
+                    raise Exception(
+                        f"Bet with id {new_bet.id} is repeated in the batch"
+                    )
+                if len(self.bets) + len(new_bets) >= MAX_BETS:
+                    raise Exception(f"Cannot create more than {MAX_BETS} bets")
+            except Exception as error:
+                if not skip_invalid:
+                    raise Exception(f"Invalid bet at position {position}: {error}")
+                errors.append({"position": position, "error": str(error)})
+                continue
+            batch_ids.add(new_bet.id)
+            new_bets.append(new_bet)
 
-Respond in JSON:
-{{
-    "outcome": str, // This should be one of the possible outcomes. e.g., "yes" or "no" 
-    "reason": str, // This should be a short explanation of why you chose the outcome. e.g., "The new AI model is expected to be released by June 20"
-}}
-It is mandatory that you respond only using the JSON format above,
-nothing else. Don't include any other words or characters,
-your output must be only JSON without any formatting prefix or suffix.
-This result should be perfectly parsable by a JSON parser without errors.
+        for new_bet in new_bets:
+            self._append_bet(new_bet)
+        self._count("bets_created", len(new_bets))
+        return {"created": [new_bet.id for new_bet in new_bets], "errors": errors}
+
+    def _append_bet(self, new_bet: Bet) -> None:
+        # Add the bet to the contract and index its position
+        self.bets.append(new_bet)
+        new_bet_index = len(self.bets) - 1
+        self.bet_index[new_bet.id] = new_bet_index
+
+        # Insert the bet in the due date index, after bets due at the same time
+        self.due_bets.append(new_bet_index)
+        position = len(self.due_bets) - 1
+        while (
+            position > self.due_head
+            and self.bets[self.due_bets[position - 1]].resolution_timestamp
+            > new_bet.resolution_timestamp
+        ):
+            self.due_bets[position] = self.due_bets[position - 1]
+            position -= 1
+        self.due_bets[position] = new_bet_index
+
+        self._update_digest("bet", _bet_tuple(new_bet))
+        self._record_change("bet_created", new_bet.id)
+
+    @gl.public.write
+    def set_bet_content_budget(self, bet_id: str, content_budget: int) -> None:
         """
-            result = gl.exec_prompt(task).replace("```json", "").replace("```", "")
-            print("result", result)
-            return json.dumps(json.loads(result), sort_keys=True)
+        Sets how many characters of web content are kept in the resolution
+        prompt of a bet. Only the contract owner can call this method.
 
-        result_json = json.loads(
-            gl.eq_principle_prompt_comparative(
-                get_bet_result, "the outcome should be the same"
+        Args:
+            bet_id: Unique identifier for the bet
+            content_budget: Maximum number of characters of web content
+        """
+        self._require_owner()
+        self._count("set_bet_content_budget.calls")
+
+        if not CONTENT_WINDOW_SIZE <= content_budget <= MAX_CONTENT_BUDGET:
+            raise Exception(
+                f"Content budget must be between {CONTENT_WINDOW_SIZE} and {MAX_CONTENT_BUDGET}"
             )
-        )
-        print("result_json", result_json)
-        return result_json
+        self.bets[self._get_bet_index(bet_id)].content_budget = content_budget
 
     @gl.public.write
-    def resolve_bet(self, bet_id: str) -> None:
+    def set_bet_rule(
+        self, bet_id: str, path: str, comparator: str, threshold: str
+    ) -> None:
+        """
+        Sets a deterministic resolution rule for a bet, which then resolves to
+        "yes" when the number found at `path` in the X payload (or in the JSON
+        served at the resolution URL) compares true against the threshold,
+        without any LLM call. Only the contract owner can call this method.
+
+        Args:
+            bet_id: Unique identifier for the bet
+            path: Dot separated keys and list indexes, e.g. "data.public_metrics.like_count".
+                An empty path removes the rule.
+            comparator: One of ">", ">=", "<", "<=", "==" or "!="
+            threshold: Number the value is compared against, e.g. "700"
+        """
         self._require_owner()
+        self._count("set_bet_rule.calls")
+        bet = self.bets[self._get_bet_index(bet_id)]
 
-        bet = next((bet for bet in self.bets if bet.id == bet_id), None)
+        if bet.has_resolved:
+            raise Exception(f"Bet {bet_id} already resolved")
 
-        if bet is None:
-            raise Exception(f"Bet with id {bet_id} not found")
+        if path:
+            if comparator not in RULE_COMPARATORS:
+                raise Exception(f"Invalid comparator: {comparator}")
+            try:
+                is_number = Decimal(threshold).is_finite()
+            except InvalidOperation:
+                is_number = False
+            if not is_number:
+                raise Exception(f"Invalid threshold: {threshold}")
+        else:
+            comparator = ""
+            threshold = ""
+
+        bet.rule_path = path
+        bet.rule_comparator = comparator
+        bet.rule_threshold = threshold
+
+    def _check_bets(self, bets: list[Bet]) -> dict:
+        # Storage is not reachable from the non-deterministic block, so copy
+        # the fields needed to resolve each bet first
+        sources = [
+            {
+                "id": bet.id,
+                "resolution_url": bet.resolution_url,
+                "resolution_x_method": bet.resolution_x_method,
+                "resolution_x_parameter": bet.resolution_x_parameter,
+                "title": bet.title,
+                "description": bet.description,
+                "content_budget": bet.content_budget,
+                "rule_path": bet.rule_path,
+                "rule_comparator": bet.rule_comparator,
+                "rule_threshold": bet.rule_threshold,
+                "resolution_mode": bet.resolution_mode or "prompt",
+            }
+            for bet in bets
+        ]
+        # A rule takes precedence over the resolution mode
+        rule_sources = [source for source in sources if source["rule_path"]]
+        evidence_sources = [
+            source
+            for source in sources
+            if not source["rule_path"] and source["resolution_mode"] == "evidence"
+        ]
+        prompt_sources = [
+            source
+            for source in sources
+            if not source["rule_path"] and source["resolution_mode"] == "prompt"
+        ]
+        verdicts = {}
+        self._count("bets_resolved_by_rule", len(rule_sources))
+        self._count("bets_resolved_by_evidence", len(evidence_sources))
+        self._count("bets_resolved_by_prompt", len(prompt_sources))
+
+        # Bets with a rule are resolved by a single strict equality round
+        def get_rule_results() -> str:
+            cache = SourceCache()
+            timings = PhaseTimings()
+            rule_verdicts = {}
+            for source in rule_sources:
+                with timings.phase("fetch"):
+                    payload = _fetch_rule_payload(source, cache)
+                with timings.phase("parse"):
+                    rule_verdicts[source["id"]] = evaluate_rule(
+                        payload,
+                        source["rule_path"],
+                        source["rule_comparator"],
+                        source["rule_threshold"],
+                    )
+            log_event("rule_timings", bets=len(rule_sources), **timings.as_ms())
+            return json.dumps(rule_verdicts, sort_keys=True)
+
+        if rule_sources:
+            verdicts.update(json.loads(gl.eq_principle_strict_eq(get_rule_results)))
+
+        def get_bets_result() -> str:
+            # Bets sharing a resolution source reuse a single fetch
+            cache = SourceCache()
+            timings = PhaseTimings()
+            verdicts = {}
+            for source in prompt_sources:
+                with timings.phase("fetch"):
+                    content = _fetch_resolution_data(source, cache)
+                with timings.phase("prompt_build"):
+                    web_data = trim_content(
+                        content,
+                        f"{source['title']} {source['description']}",
+                        source["content_budget"],
+                    )
+                verdicts[source["id"]] = _classify_bet(source, web_data, timings)
+            log_event("prompt_timings", bets=len(prompt_sources), **timings.as_ms())
+            return json.dumps(verdicts, sort_keys=True)
+
+        # Evidence bets: the leader classifies each bet and quotes its source,
+        # validators only confirm the quote and that it supports the outcome
+        def get_evidence_verdicts() -> dict:
+            cache = SourceCache()
+            timings = PhaseTimings()
+            evidence_verdicts = {}
+            for source in evidence_sources:
+                with timings.phase("fetch"):
+                    content = _fetch_resolution_data(source, cache)
+                evidence_verdicts[source["id"]] = _collect_evidence(
+                    source, content, timings
+                )
+            log_event("evidence_timings", bets=len(evidence_sources), **timings.as_ms())
+            return evidence_verdicts
+
+        def check_evidence_verdicts(leader_result) -> bool:
+            if not isinstance(leader_result, gl.vm.Return):
+                return False
+            leader_verdicts = leader_result.calldata
+            if not isinstance(leader_verdicts, dict) or set(leader_verdicts) != {
+                source["id"] for source in evidence_sources
+            }:
+                return False
+            cache = SourceCache()
+            timings = PhaseTimings()
+            agreed = all(
+                _check_evidence(
+                    source,
+                    _fetch_resolution_data(source, cache),
+                    leader_verdicts[source["id"]],
+                    timings,
+                )
+                for source in evidence_sources
+            )
+            log_event("evidence_checks", agreed=agreed, **timings.as_ms())
+            return agreed
+
+        if evidence_sources:
+            evidence_verdicts = gl.vm.run_nondet(
+                get_evidence_verdicts, check_evidence_verdicts
+            )
+            for bet_id, verdict in evidence_verdicts.items():
+                verdicts[bet_id] = {
+                    "outcome": verdict["outcome"],
+                    "reason": f'{verdict["reason"]} Evidence: "{verdict["evidence"]}"',
+                }
+
+        if prompt_sources:
+            result_json = json.loads(
+                gl.eq_principle_prompt_comparative(
+                    get_bets_result, "the outcome of each bet should be the same"
+                )
+            )
+            log_event("prompt_verdicts", verdicts=json.dumps(result_json))
+            verdicts.update(result_json)
+        return verdicts
+
+    def _get_resolvable_bet(self, bet_id: str) -> tuple[int, Bet]:
+        bet_index = self._get_bet_index(bet_id)
+        bet = self.bets[bet_index]
 
         if bet.has_resolved:
-            raise Exception("Bet already resolved")
+            raise Exception(f"Bet {bet_id} already resolved")
 
-        if datetime.now(timezone.utc) < datetime.strptime(
-            bet.resolution_date, "%Y-%m-%d"
-        ).replace(tzinfo=timezone.utc):
-            raise Exception("It is too soon to resolve this bet")
+        if datetime.now(timezone.utc).timestamp() < bet.resolution_timestamp:
+            raise Exception(f"It is too soon to resolve bet {bet_id}")
 
-        bet_status = self._check_bet(bet)
+        return bet_index, bet
 
+    def _apply_resolution(self, bet_index: int, bet: Bet, bet_status: dict) -> None:
+        self._update_digest("bet", _bet_tuple(bet), sign=-1)
         bet.has_resolved = True
         bet.outcome = bet_status[
             "outcome"
         ].lower()  # Store as lowercase for consistency
         bet.reason = bet_status["reason"]
+        self._update_digest("bet", _bet_tuple(bet))
 
-        # Find the bet index in the bets array
-        bet_index = next((i for i, b in enumerate(self.bets) if b.id == bet_id), None)
-        if bet_index is None:
-            raise Exception(f"Bet with id {bet_id} not found in bets array")
+        # Points are computed on read from the packed masks, so resolving a
+        # bet only flips its bits. The leaderboard catches up in
+        # `apply_scores`. Unexpected outcomes award no points.
+        bet_bit = 1 << bet_index
+        if bet.outcome in VALID_OUTCOMES:
+            self.resolved_mask |= bet_bit
+            if len(self.player_addresses) == 0:
+                self.scored_mask |= bet_bit
+        if bet.outcome == "yes":
+            self.outcome_mask |= bet_bit
 
-        # Evaluate all user bets and award points
-        for user_address, user_bets_array in self.user_bets.items():
-            # Check if user has placed a bet on this specific bet
-            if (
-                bet_index < len(user_bets_array)
-                and user_bets_array[bet_index] is not None
-            ):
-                user_bet_outcome = user_bets_array[bet_index]
+        self._count("bets_resolved")
+
+        # Skip the resolved prefix of the due date index
+        while (
+            self.due_head < len(self.due_bets)
+            and self.bets[self.due_bets[self.due_head]].has_resolved
+        ):
+            self.due_head += 1
+
+        self._record_change("bet_resolved", bet.id, bet.outcome)
+        if bet.outcome in VALID_OUTCOMES:
+            # Every player who picked the outcome of this bet gained a point
+            self._record_change("points_changed", bet.id, bet.outcome)
+
+    @gl.public.write
+    def apply_scores(self, bet_id: str, limit: int) -> int:
+        """
+        Moves the players who picked the outcome of a resolved bet up one
+        leaderboard bucket, `limit` players per call in registration order,
+        so resolving stays independent of the number of players. Until every
+        player is applied, `get_leaderboard` and `get_rank` report a stale
+        ranking. Only the contract owner can call this method.
+
+        Args:
+            bet_id: Unique identifier of a bet resolved to "yes" or "no"
+            limit: Maximum number of players to go through
+
+        Returns:
+            int: Number of players still to go through for this bet
+        """
+        self._require_owner()
+        self._check_page(0, limit)
+        self._count("apply_scores.calls")
+        bet_index = self._get_bet_index(bet_id)
+        bet_bit = 1 << bet_index
+
+        if not self.resolved_mask & bet_bit:
+            raise Exception(f"Bet {bet_id} has no scores to apply")
+        if self.scored_mask & bet_bit:
+            raise Exception(f"Scores of bet {bet_id} are already applied")
+
+        pick_bits = (bet_bit << MAX_BETS) | bet_bit
+        winning_bits = pick_bits if self.outcome_mask & bet_bit else bet_bit << MAX_BETS
+        total_players = len(self.player_addresses)
+        start = self.score_cursors.get(bet_index, 0)
+        end = min(start + limit, total_players)
+        moved = 0
+        for position in range(start, end):
+            user_address = self.player_addresses[position]
+            player = self.players[user_address]
+            if player.picks & pick_bits == winning_bits:
+                self._raise_score(user_address, player)
+                moved += 1
+        self._count("apply_scores.players_scanned", end - start)
+        self._count("apply_scores.players_moved", moved)
+
+        # Players registering later are appended, so the cursor reaches them
+        self.score_cursors[bet_index] = end
+        if end == total_players:
+            self.scored_mask |= bet_bit
+        return total_players - end
+
+    @gl.public.write
+    def set_bet_resolution_mode(self, bet_id: str, mode: str) -> None:
+        """
+        Selects how a bet without a rule is resolved. Only the contract owner
+        can call this method.
+
+        Args:
+            bet_id: Unique identifier for the bet
+            mode: "prompt" (default) to have every validator fetch the source
+                and classify the bet again, or "evidence" to have validators
+                only confirm the leader's excerpt of the source and run a
+                short yes/no agreement prompt on it
+        """
+        self._require_owner()
+        self._count("set_bet_resolution_mode.calls")
+        bet = self.bets[self._get_bet_index(bet_id)]
+
+        if bet.has_resolved:
+            raise Exception(f"Bet {bet_id} already resolved")
+        if mode not in RESOLUTION_MODES:
+            raise Exception(
+                f"Invalid resolution mode: {mode}. Must be 'prompt' or 'evidence'"
+            )
+        bet.resolution_mode = mode
+
+    @gl.public.write
+    def resolve_bet(self, bet_id: str) -> None:
+        self._require_owner()
+        self._count("resolve_bet.calls")
+
+        bet_index, bet = self._get_resolvable_bet(bet_id)
+        bet_status = self._check_bets([bet])[bet_id]
+        self._apply_resolution(bet_index, bet, bet_status)
+
+    @gl.public.write
+    def resolve_bets(self, bet_ids: list[str]) -> None:
+        """
+        Resolves several bets in a single transaction. Every source is fetched
+        and classified inside one non-deterministic block, so the whole batch
+        goes through a single consensus round and is applied atomically.
+
+        Args:
+            bet_ids: Unique identifiers of the bets to resolve
+        """
+        self._require_owner()
+        self._count("resolve_bets.calls")
+
+        if not bet_ids:
+            raise Exception("At least one bet id must be provided")
+        if len(set(bet_ids)) != len(bet_ids):
+            raise Exception("Bet ids must not be repeated")
+
+        resolvable_bets = [self._get_resolvable_bet(bet_id) for bet_id in bet_ids]
+        verdicts = self._check_bets([bet for _, bet in resolvable_bets])
+
+        for bet_index, bet in resolvable_bets:
+            if bet.id not in verdicts:
+                raise Exception(f"Missing verdict for bet {bet.id}")
+            self._apply_resolution(bet_index, bet, verdicts[bet.id])
 
-                # Check if the user's prediction matches the actual outcome
-                if user_bet_outcome.lower() == bet.outcome:
-                    # Increment overall points for this user
-                    if user_address not in self.overall_points:
-                        self.overall_points[user_address] = 0
-                    self.overall_points[user_address] += 1
+    def _serialize_bet_metadata(self, bet: Bet) -> dict:
+        return {
+            "id": bet.id,
+            "resolution_date": format_resolution_date(bet.resolution_timestamp),
+            "resolution_timestamp": bet.resolution_timestamp,
+            "has_resolved": bet.has_resolved,
+            "resolution_url": bet.resolution_url,
+            "resolution_x_method": bet.resolution_x_method,
+            "resolution_x_parameter": bet.resolution_x_parameter,
+            "title": bet.title,
+            "description": bet.description,
+            "category": bet.category,
+            "outcome": bet.outcome,
+            "reason": bet.reason,
+        }
+
+    def _serialize_bet(self, bet_index: int, bet: Bet) -> dict:
+        # Collect user bets for this specific bet
+        users_bets_for_this_bet = {}
+        users_points_for_this_bet = {}
+        scores = (self.resolved_mask >> bet_index) & 1 == 1
+        winning_pick = _unpack_pick(self.outcome_mask, bet_index)
+
+        for user_address, player in self.players.items():
+            user_pick = _unpack_pick(player.picks, bet_index, check_participation=True)
+            if user_pick is None:
+                continue
+            users_bets_for_this_bet[user_address.as_hex] = user_pick
+            users_points_for_this_bet[user_address.as_hex] = (
+                1 if scores and user_pick == winning_pick else 0
+            )
+
+        serialized_bet = self._serialize_bet_metadata(bet)
+        serialized_bet["users_bets"] = users_bets_for_this_bet
+        serialized_bet["users_points"] = users_points_for_this_bet
+        return serialized_bet
 
     @gl.public.view
     def get_bets(self) -> dict:
-        serialized_bets = []
-        for bet_index, bet in enumerate(self.bets):
-            # Collect user bets for this specific bet
-            users_bets_for_this_bet = {}
-            users_points_for_this_bet = {}
+        return [
+            self._serialize_bet(bet_index, bet)
+            for bet_index, bet in enumerate(self.bets)
+        ]
 
-            for user_address, user_bets_array in self.user_bets.items():
-                if (
-                    bet_index < len(user_bets_array)
-                    and user_bets_array[bet_index] is not None
-                ):
-                    users_bets_for_this_bet[user_address.as_hex] = user_bets_array[
-                        bet_index
-                    ]
-
-                    # Calculate points for this user on this bet
-                    if (
-                        bet.has_resolved
-                        and user_bets_array[bet_index].lower() == bet.outcome
-                    ):
-                        users_points_for_this_bet[user_address.as_hex] = 1
-                    else:
-                        users_points_for_this_bet[user_address.as_hex] = 0
-
-            serialized_bet = {
-                "id": bet.id,
-                "resolution_date": bet.resolution_date,
-                "has_resolved": bet.has_resolved,
-                "resolution_url": bet.resolution_url,
-                "resolution_x_method": bet.resolution_x_method,
-                "resolution_x_parameter": bet.resolution_x_parameter,
-                "title": bet.title,
-                "description": bet.description,
-                "category": bet.category,
-                "outcome": bet.outcome,
-                "reason": bet.reason,
-                "users_bets": users_bets_for_this_bet,
-                "users_points": users_points_for_this_bet,
-            }
-            serialized_bets.append(serialized_bet)
-        return serialized_bets
+    @gl.public.view
+    def get_bet(self, bet_id: str) -> dict:
+        """
+        Returns a single bet, looked up through the bet id index.
+
+        Args:
+            bet_id: Unique identifier for the bet
+        """
+        bet_index = self._get_bet_index(bet_id)
+        return self._serialize_bet(bet_index, self.bets[bet_index])
+
+    @gl.public.view
+    def get_bets_summary(self) -> list:
+        """
+        Returns the metadata of every bet without any player picks.
+        """
+        return [self._serialize_bet_metadata(bet) for bet in self.bets]
+
+    @gl.public.view
+    def get_bet_participants(self, bet_id: str, offset: int, limit: int) -> dict:
+        """
+        Returns one page of the players' picks for a bet.
+
+        Args:
+            bet_id: Unique identifier for the bet
+            offset: Position of the first player of the page, in registration order
+            limit: Maximum number of players to include in the page
+
+        Returns:
+            dict: The picks and points of the players in the page, keyed by
+                address, and the offset of the next page (None on the last page)
+        """
+        self._check_page(offset, limit)
+        bet_index = self._get_bet_index(bet_id)
+        bet = self.bets[bet_index]
+        scores = (self.resolved_mask >> bet_index) & 1 == 1
+        winning_pick = _unpack_pick(self.outcome_mask, bet_index)
+
+        users_bets = {}
+        users_points = {}
+        total_players = len(self.player_addresses)
+        end = min(offset + limit, total_players)
+        for i in range(offset, end):
+            user_address = self.player_addresses[i]
+            player = self.players[user_address]
+            user_pick = _unpack_pick(player.picks, bet_index, check_participation=True)
+            if user_pick is None:
+                continue
+            users_bets[user_address.as_hex] = user_pick
+            users_points[user_address.as_hex] = (
+                1 if scores and user_pick == winning_pick else 0
+            )
+
+        return {
+            "bet_id": bet.id,
+            "users_bets": users_bets,
+            "users_points": users_points,
+            "total_players": total_players,
+            "next_offset": end if end < total_players else None,
+        }
+
+    @gl.public.view
+    def get_resolvable_bets(self, now: int, limit: int) -> list:
+        """
+        Returns the ids of the unresolved bets that are due, earliest first.
+
+        Args:
+            now: Current time as epoch seconds
+            limit: Maximum number of bet ids to return
+        """
+        self._check_page(0, limit)
+        bet_ids = []
+        for position in range(self.due_head, len(self.due_bets)):
+            bet = self.bets[self.due_bets[position]]
+            if bet.resolution_timestamp > now or len(bet_ids) == limit:
+                break
+            if not bet.has_resolved:
+                bet_ids.append(bet.id)
+        return bet_ids
+
+    @gl.public.view
+    def get_changes_since(self, seq: int, limit: int) -> dict:
+        """
+        Returns the changes recorded after a state sequence number, oldest first.
+
+        Args:
+            seq: Last sequence number the caller has applied (0 for none)
+            limit: Maximum number of changes to return
+
+        Returns:
+            dict: The changes, the latest sequence number and whether the
+                changes are complete. Incomplete means older records were
+                already dropped from the log and the caller must resync
+                from the full views.
+        """
+        self._check_page(0, limit)
+        latest_seq = self.state_seq
+        oldest_seq = latest_seq - len(self.change_log) + 1
+        first_seq = max(seq + 1, oldest_seq)
+
+        changes = []
+        for record_seq in range(first_seq, min(latest_seq, seq + limit) + 1):
+            record = self.change_log[(record_seq - 1) % CHANGE_LOG_CAPACITY]
+            changes.append(
+                {
+                    "seq": record.seq,
+                    "kind": record.kind,
+                    "subject": record.subject,
+                    "detail": record.detail,
+                }
+            )
+
+        return {
+            "changes": changes,
+            "latest_seq": latest_seq,
+            "complete": seq + 1 >= oldest_seq,
+        }
+
+    @gl.public.view
+    def get_state_chunk(self, cursor: int, max_items: int) -> dict:
+        """
+        Returns a page of the full state for cold syncs: bets first, then
+        players in registration order, as tuples in the order of
+        `BET_TUPLE_FIELDS` and `PLAYER_TUPLE_FIELDS`. Player picks are the
+        packed mask as a hex string.
+
+        Chunks can be fetched in parallel. The sum of their `chunk_digest`
+        values modulo 2**256 equals `state_digest` when the chunks were read
+        at the same `state_seq`.
+
+        Args:
+            cursor: Position of the first item, 0 for the first chunk
+            max_items: Maximum number of bets and players in the chunk
+
+        Returns:
+            dict: The bet and player tuples, the cursor of the next chunk (None
+                after the last one), the total item count, the chunk and state
+                digests as hex strings and the state sequence number
+        """
+        self._check_page(cursor, max_items)
+        bet_count = len(self.bets)
+        total_items = bet_count + len(self.player_addresses)
+        end = min(cursor + max_items, total_items)
+
+        bets = []
+        players = []
+        chunk_digest = 0
+        for position in range(cursor, end):
+            if position < bet_count:
+                kind = "bet"
+                item = _bet_tuple(self.bets[position])
+                bets.append(item)
+            else:
+                user_address = self.player_addresses[position - bet_count]
+                kind = "player"
+                item = _player_tuple(user_address, self.players[user_address])
+                players.append(item)
+            chunk_digest = (
+                chunk_digest + state_item_digest(kind, item)
+            ) % STATE_DIGEST_MODULUS
+
+        return {
+            "bets": bets,
+            "players": players,
+            "next_cursor": end if end < total_items else None,
+            "total_items": total_items,
+            "chunk_digest": hex(chunk_digest),
+            "state_digest": hex(self.state_digest),
+            "state_seq": self.state_seq,
+        }
 
     @gl.public.view
     def get_points(self) -> dict:
-        return {k.as_hex: v for k, v in self.overall_points.items()}
+        points = {}
+        for user_address, player in self.players.items():
+            user_points = self._count_points(player.picks)
+            if user_points > 0:
+                points[user_address.as_hex] = user_points
+        return points
 
     @gl.public.view
     def get_player_points(self, player_address: str) -> int:
-        return self.overall_points.get(Address(player_address), 0)
+        player = self.players.get(Address(player_address))
+        return 0 if player is None else self._count_points(player.picks)
+
+    @gl.public.view
+    def get_leaderboard(self, offset: int, limit: int) -> dict:
+        """
+        Returns one page of the players ranked by points.
+
+        Args:
+            offset: Number of ranked players to skip
+            limit: Maximum number of players to include in the page
+
+        Returns:
+            dict: The page entries (address, points and rank, where tied players
+                share a rank), the total number of players, the offset of the
+                next page (None on the last page) and whether the ranking is
+                stale because resolved bets still wait for `apply_scores`
+        """
+        self._check_page(offset, limit)
+        entries = []
+        position = 0
+        for points in range(self._top_points(), -1, -1):
+            if points not in self.score_members:
+                continue
+            members = self.score_members[points]
+            members_count = len(members)
+            if position + members_count > offset:
+                # Tied players share the rank of the first player of the bucket
+                rank = position + 1
+                for i in range(max(offset - position, 0), members_count):
+                    if len(entries) == limit:
+                        break
+                    entries.append(
+                        {"address": members[i].as_hex, "points": points, "rank": rank}
+                    )
+            position += members_count
+            if len(entries) == limit:
+                break
+
+        total_players = len(self.player_addresses)
+        next_offset = offset + len(entries)
+        return {
+            "entries": entries,
+            "total_players": total_players,
+            "next_offset": next_offset if next_offset < total_players else None,
+            "stale": self._scores_stale(),
+        }
+
+    @gl.public.view
+    def get_rank(self, player_address: str) -> dict:
+        """
+        Returns the leaderboard rank of a player (1 is best, tied players share
+        a rank, 0 if the address has not placed any bets) and whether the
+        ranking is stale because resolved bets still wait for `apply_scores`.
+        """
+        stale = self._scores_stale()
+        player = self.players.get(Address(player_address))
+        if player is None:
+            return {"rank": 0, "stale": stale}
+        rank = 1
+        for points in range(player.score + 1, self._top_points() + 1):
+            if points in self.score_members:
+                rank += len(self.score_members[points])
+        return {"rank": rank, "stale": stale}
 
     @gl.public.view
     def get_all_user_bets(self) -> dict:
@@ -268,25 +1008,24 @@ This result should be perfectly parsable by a JSON parser without errors.
         user_handlers = {}
         user_bet_selections = {}
 
-        for user_address, user_bets_array in self.user_bets.items():
+        for user_address, player in self.players.items():
             user_addresses.append(user_address.as_hex)
 
             # Get social handles
-            x_handler = self.x_handlers.get(user_address, "")
-            discord_handler = self.discord_handlers.get(user_address, "")
             user_handlers[user_address.as_hex] = {
-                "x_handler": x_handler,
-                "discord_handler": discord_handler,
+                "x_handler": player.x_handler,
+                "discord_handler": player.discord_handler,
             }
 
             # Get bet selections
             bet_selections = []
-            for i, bet_outcome in enumerate(user_bets_array):
-                if i < len(self.bets):
+            for i, bet in enumerate(self.bets):
+                bet_outcome = _unpack_pick(player.picks, i, check_participation=True)
+                if bet_outcome is not None:
                     bet_selections.append(
                         {
-                            "bet_id": self.bets[i].id,
-                            "bet_title": self.bets[i].title,
+                            "bet_id": bet.id,
+                            "bet_title": bet.title,
                             "selected_outcome": bet_outcome,
                         }
                     )
@@ -300,6 +1039,90 @@ This result should be perfectly parsable by a JSON parser without errors.
             "total_users": len(user_addresses),
         }
 
+    @gl.public.view
+    def get_user_bets(self, player_address: str) -> dict | None:
+        """
+        Returns the handles, bet selections and points of a single player.
+
+        Returns:
+            dict | None: The player's social handles, points and bet selections,
+                where `is_correct` is None until the bet resolves to "yes" or
+                "no". None if the address has not placed any bets.
+        """
+        user_address = Address(player_address)
+        player = self.players.get(user_address)
+        if player is None:
+            return None
+
+        bet_selections = []
+        for i, bet in enumerate(self.bets):
+            bet_outcome = _unpack_pick(player.picks, i, check_participation=True)
+            if bet_outcome is None:
+                continue
+            is_correct = None
+            if (self.resolved_mask >> i) & 1:
+                is_correct = bet_outcome == _unpack_pick(self.outcome_mask, i)
+            bet_selections.append(
+                {
+                    "bet_id": bet.id,
+                    "bet_title": bet.title,
+                    "selected_outcome": bet_outcome,
+                    "is_correct": is_correct,
+                }
+            )
+
+        return {
+            "address": user_address.as_hex,
+            "x_handler": player.x_handler,
+            "discord_handler": player.discord_handler,
+            "points": self._count_points(player.picks),
+            "bet_selections": bet_selections,
+        }
+
+    @gl.public.view
+    def get_player_by_handle(self, kind: str, handle: str) -> str | None:
+        """
+        Returns the address of the player registered with a handle.
+
+        Args:
+            kind: "discord" or "x"
+            handle: The handle, compared case-insensitively and without a leading "@"
+
+        Returns:
+            str | None: The player's address, or None if no player uses the handle
+        """
+        if kind == "discord":
+            index = self.discord_index
+        elif kind == "x":
+            index = self.x_index
+        else:
+            raise Exception(f"Invalid handle kind: {kind}. Must be 'discord' or 'x'")
+        user_address = index.get(normalize_handle(handle))
+        return None if user_address is None else user_address.as_hex
+
+    @gl.public.view
+    def get_metrics(self) -> dict:
+        """
+        Returns the persistent counters of the write methods: "<method>.calls"
+        for every successful call, plus bets created and resolved (by rule,
+        evidence or prompt), players registered, and the players scanned and
+        moved up the leaderboard by `apply_scores`, the only write that goes
+        through the players.
+        Current sizes of the main collections and the number of resolved bets
+        still waiting for `apply_scores` are included as gauges.
+        """
+        return {
+            "counters": {name: value for name, value in self.metrics.items()},
+            "gauges": {
+                "bets": len(self.bets),
+                "due_bets": len(self.due_bets) - self.due_head,
+                "players": len(self.player_addresses),
+                "pending_scores": (self.resolved_mask & ~self.scored_mask).bit_count(),
+                "state_seq": self.state_seq,
+                "change_log": len(self.change_log),
+            },
+        }
+
     @gl.public.view
     def get_owner(self) -> str:
         """
@@ -327,44 +1150,765 @@ This result should be perfectly parsable by a JSON parser without errors.
             bet_2_outcome: The outcome the user is betting on for bet 2 ("yes" or "no")
         """
 
+        self._count("place_bets.calls")
+
         # Get the sender's address
         user_address = gl.message.sender_address
-        if user_address in self.x_handlers:
-            raise Exception("User already registered a bet")
-        if user_address in self.discord_handlers:
-            raise Exception("User already registered a bet")
-        if user_address in self.user_bets:
-            raise Exception("User already registered a bet")
+        self._require_unregistered(user_address)
 
         # Validate that we have exactly 3 bets
         if len(self.bets) != 3:
             raise Exception("There must be exactly 3 bets available")
 
-        # Validate that the outcomes are valid ("yes" or "no")
-        valid_outcomes = ["yes", "no"]
-        if bet_0_outcome.lower() not in valid_outcomes:
-            raise Exception(
-                f"Invalid outcome for bet 0: {bet_0_outcome}. Must be 'yes' or 'no'"
-            )
-        if bet_1_outcome.lower() not in valid_outcomes:
+        # Normalize once and validate that the outcomes are valid ("yes" or "no")
+        outcomes = [
+            bet_0_outcome.strip().lower(),
+            bet_1_outcome.strip().lower(),
+            bet_2_outcome.strip().lower(),
+        ]
+        for i, outcome in enumerate(outcomes):
+            if outcome not in VALID_OUTCOMES:
+                raise Exception(
+                    f"Invalid outcome for bet {i}: {outcome}. Must be 'yes' or 'no'"
+                )
+        now = datetime.now(timezone.utc).timestamp()
+        for bet in self.bets:
+            self._require_open(bet, now)
+
+        self._register_player(
+            user_address, user_discord_handler, user_x_handler, _pack_picks(outcomes)
+        )
+
+    @gl.public.write
+    def place_bets_v2(
+        self, user_discord_handler: str, user_x_handler: str, outcomes: str
+    ) -> None:
+        """
+        Allows users to place their picks on every market in a single call.
+
+        Args:
+            user_discord_handler: Discord handler for the user
+            user_x_handler: X (Twitter) handler for the user
+            outcomes: One character per bet, in creation order: "y" for yes,
+                "n" for no, or "-" to skip the bet. Bets past their resolution
+                date are closed and must be skipped.
+        """
+        self._count("place_bets_v2.calls")
+        user_address = gl.message.sender_address
+        self._require_unregistered(user_address)
+        self._register_player(
+            user_address,
+            user_discord_handler,
+            user_x_handler,
+            self._parse_packed_outcomes(outcomes),
+        )
+
+    @gl.public.write
+    def migrate_resolutions(self, resolutions: list[list[str]]) -> None:
+        """
+        Copies the outcomes of bets resolved on a previous deployment, without
+        fetching their sources again. Only the contract owner can call this
+        method, until `finish_migration` is called.
+
+        Args:
+            resolutions: [bet id, outcome, reason] records, as returned by
+                the `get_bets` of the previous deployment
+        """
+        self._require_owner()
+        self._require_migration_open()
+        self._count("migrate_resolutions.calls")
+        if not resolutions:
+            raise Exception("At least one resolution must be provided")
+
+        # Validate the whole batch before resolving any bet
+        resolved = []
+        batch_ids = set()
+        for position, resolution in enumerate(resolutions):
+            if (
+                not isinstance(resolution, list)
+                or len(resolution) != 3
+                or not all(isinstance(v, str) for v in resolution)
+            ):
+                raise Exception(
+                    f"Invalid resolution at position {position}: "
+                    "Resolution must be [bet id, outcome, reason] strings"
+                )
+            bet_id, outcome, reason = resolution
+            bet_index = self._get_bet_index(bet_id)
+            bet = self.bets[bet_index]
+            if bet.has_resolved or bet_id in batch_ids:
+                raise Exception(f"Bet {bet_id} is already resolved")
+            batch_ids.add(bet_id)
+            resolved.append((bet_index, bet, {"outcome": outcome, "reason": reason}))
+
+        for bet_index, bet, bet_status in resolved:
+            self._apply_resolution(bet_index, bet, bet_status)
+
+    @gl.public.write
+    def migrate_user_bets(self, records: list[list[str]]) -> dict:
+        """
+        Registers the players of a previous deployment with their picks, in
+        the `import_user_bets` record format. Unlike `import_user_bets`, picks
+        on closed and resolved bets are kept and score like on the previous
+        deployment. Only the contract owner can call this method, until
+        `finish_migration` is called.
+
+        Returns:
+            dict: The number of imported players and an empty error list
+        """
+        self._require_owner()
+        self._require_migration_open()
+        self._count("migrate_user_bets.calls")
+        return self._import_records(records, skip_invalid=False, allow_closed=True)
+
+    @gl.public.write
+    def finish_migration(self) -> None:
+        """
+        Disables `migrate_resolutions` and `migrate_user_bets` for good, so
+        the owner can no longer set outcomes or picks past the closing dates.
+        Only the contract owner can call this method.
+        """
+        self._require_owner()
+        self._require_migration_open()
+        self.migration_open = False
+
+    def _require_migration_open(self) -> None:
+        if not self.migration_open:
+            raise Exception("Migration is finished")
+
+    @gl.public.write
+    def import_user_bets(
+        self, records: list[list[str]], skip_invalid: bool = False
+    ) -> dict:
+        """
+        Registers players whose picks were collected off-chain, in a single
+        transaction. Only the contract owner can call this method.
+
+        Every record is validated like `place_bets_v2`, against the registered
+        players and within the batch, before any player is written. Without
+        `skip_invalid`, any invalid record aborts the call.
+
+        Args:
+            records: [address, discord handler, x handler, outcomes] records,
+                with outcomes in the `place_bets_v2` format
+            skip_invalid: Import the valid records and report the invalid ones
+                instead of aborting
+
+        Returns:
+            dict: The number of imported players and the errors of the skipped
+                records, each with its position in the batch
+        """
+        self._require_owner()
+        self._count("import_user_bets.calls")
+        return self._import_records(records, skip_invalid, allow_closed=False)
+
+    def _import_records(
+        self, records: list[list[str]], skip_invalid: bool, allow_closed: bool
+    ) -> dict:
+        if not records:
+            raise Exception("At least one record must be provided")
+
+        imports = []
+        batch_addresses = set()
+        batch_handles = set()
+        errors = []
+        for position, record in enumerate(records):
+            try:
+                if (
+                    not isinstance(record, list)
+                    or len(record) != 4
+                    or not all(isinstance(v, str) for v in record)
+                ):
+                    raise Exception(
+                        "Record must be [address, discord, x, outcomes] strings"
+                    )
+                address, discord_handler, x_handler, outcomes = record
+                user_address = Address(address)
+                if user_address in batch_addresses:
+                    raise Exception("User already registered a bet")
+                self._require_unregistered(user_address)
+                handles = [
+                    (kind, handle)
+                    for kind, handle in (
+                        ("discord", normalize_handle(discord_handler)),
+                        ("x", normalize_handle(x_handler)),
+                    )
+                    if handle
+                ]
+                for kind, handle in handles:
+                    index = self.discord_index if kind == "discord" else self.x_index
+                    if handle in index or (kind, handle) in batch_handles:
+                        raise Exception(f"Handle {handle} is already registered")
+                user_mask = self._parse_packed_outcomes(outcomes, allow_closed)
+            except Exception as error:
+                if not skip_invalid:
+                    raise Exception(
+                        f"Invalid record at position {position}: {error}"
+                    )
+                errors.append({"position": position, "error": str(error)})
+                continue
+            batch_addresses.add(user_address)
+            batch_handles.update(handles)
+            imports.append((user_address, discord_handler, x_handler, user_mask))
+
+        for user_address, discord_handler, x_handler, user_mask in imports:
+            self._register_player(user_address, discord_handler, x_handler, user_mask)
+        return {"imported": len(imports), "errors": errors}
+
+    def _require_unregistered(self, user_address: Address) -> None:
+        if user_address in self.players:
+            raise Exception("User already registered a bet")
+
+    def _parse_packed_outcomes(self, outcomes: str, allow_closed: bool = False) -> int:
+        # Validates the compact outcome string in one pass and packs it
+        outcomes = outcomes.strip().lower()
+        if len(outcomes) != len(self.bets):
             raise Exception(
-                f"Invalid outcome for bet 1: {bet_1_outcome}. Must be 'yes' or 'no'"
+                f"Expected {len(self.bets)} outcomes, got {len(outcomes)}"
             )
-        if bet_2_outcome.lower() not in valid_outcomes:
+
+        now = datetime.now(timezone.utc).timestamp()
+        user_mask = 0
+        for i, outcome in enumerate(outcomes):
+            if outcome == SKIPPED_OUTCOME:
+                continue
+            if outcome not in PACKED_OUTCOMES:
+                raise Exception(
+                    f"Invalid outcome for bet {i}: {outcome}. Must be 'y', 'n' or '-'"
+                )
+            if not allow_closed:
+                self._require_open(self.bets[i], now)
+            user_mask |= 1 << (MAX_BETS + i)
+            if PACKED_OUTCOMES[outcome] == "yes":
+                user_mask |= 1 << i
+
+        if user_mask == 0:
+            raise Exception("At least one outcome must be provided")
+        return user_mask
+
+    def _require_open(self, bet: Bet, now: float) -> None:
+        # Picks on a bet score whenever they were placed, so they are only
+        # taken while its outcome cannot be known yet
+        if bet.has_resolved:
+            raise Exception(f"Bet {bet.id} is already resolved")
+        if now >= bet.resolution_timestamp:
+            raise Exception(f"Bet {bet.id} is closed")
+
+    def _register_player(
+        self,
+        user_address: Address,
+        user_discord_handler: str,
+        user_x_handler: str,
+        user_mask: int,
+    ) -> None:
+        player = Player(
+            discord_handler=user_discord_handler,
+            x_handler=user_x_handler,
+            picks=user_mask,
+            # Bets still being applied reach the player through `apply_scores`
+            score=self._count_points(user_mask, self.scored_mask),
+        )
+        handle_indexes = self._handle_indexes(player)
+        for index, handle in handle_indexes:
+            if handle and handle in index:
+                raise Exception(f"Handle {handle} is already registered")
+
+        self.players[user_address] = player
+        for index, handle in handle_indexes:
+            if handle:
+                index[handle] = user_address
+        self.player_addresses.append(user_address)
+
+        self._add_score(user_address, player.score)
+
+        self._update_digest("player", _player_tuple(user_address, player))
+        self._record_change("player_registered", user_address.as_hex)
+        self._count("players_registered")
+
+    def _handle_indexes(self, player: Player) -> list:
+        # (reverse index, normalized handle) pairs of a player
+        return [
+            (self.discord_index, normalize_handle(player.discord_handler)),
+            (self.x_index, normalize_handle(player.x_handler)),
+        ]
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        if amount:
+            self.metrics[name] = self.metrics.get(name, 0) + amount
+
+    def _update_digest(self, kind: str, item: list, sign: int = 1) -> None:
+        # Adds (or with `sign=-1` removes) a tuple from the state digest
+        self.state_digest = (
+            self.state_digest + sign * state_item_digest(kind, item)
+        ) % STATE_DIGEST_MODULUS
+
+    def _record_change(self, kind: str, subject: str, detail: str = "") -> None:
+        self.state_seq += 1
+        record = ChangeRecord(
+            seq=self.state_seq, kind=kind, subject=subject, detail=detail
+        )
+        if len(self.change_log) < CHANGE_LOG_CAPACITY:
+            self.change_log.append(record)
+        else:
+            self.change_log[(self.state_seq - 1) % CHANGE_LOG_CAPACITY] = record
+
+
+def _new_bet(
+    bet_id: str,
+    resolution_date: str,
+    resolution_url: str,
+    resolution_x_method: str,
+    resolution_x_parameter: str,
+    title: str,
+    description: str,
+    category: str,
+) -> Bet:
+    return Bet(
+        id=bet_id,
+        resolution_timestamp=parse_resolution_date(resolution_date),
+        has_resolved=False,
+        resolution_url=resolution_url,
+        resolution_x_method=resolution_x_method,
+        resolution_x_parameter=resolution_x_parameter,
+        title=title,
+        description=description,
+        category=category,
+        outcome="",  # Default value, will be set when resolved
+        reason="",  # Default value, will be set when resolved
+        content_budget=DEFAULT_CONTENT_BUDGET,
+        rule_path="",
+        rule_comparator="",
+        rule_threshold="",
+        resolution_mode="prompt",
+    )
+
+
+def _new_bet_from_entry(entry: typing.Any) -> Bet:
+    """
+    Builds a bet from one `create_bets` entry
+    """
+    if not isinstance(entry, dict):
+        raise Exception("Bet must be a JSON object")
+    fields = {}
+    for field in CREATE_BET_FIELDS:
+        value = entry.get(field, "")
+        if not isinstance(value, str):
+            raise Exception(f"Field {field} must be a string")
+        if field in CREATE_BET_REQUIRED_FIELDS and not value:
+            raise Exception(f"Field {field} is required")
+        fields[field] = value
+    unknown = sorted(set(entry) - set(CREATE_BET_FIELDS))
+    if unknown:
+        raise Exception(f"Unknown fields: {', '.join(unknown)}")
+    return _new_bet(**fields)
+
+
+def _bet_tuple(bet: Bet) -> list:
+    return [getattr(bet, field) for field in BET_TUPLE_FIELDS]
+
+
+def _player_tuple(user_address: Address, player: Player) -> list:
+    return [
+        user_address.as_hex,
+        player.discord_handler,
+        player.x_handler,
+        hex(player.picks),
+    ]
+
+
+def state_item_digest(kind: str, item: list) -> int:
+    """
+    Hashes one state tuple. The state digest is the sum of these hashes, so
+    single tuples can be added and removed without rehashing the whole state.
+    """
+    encoded = json.dumps([kind, *item], separators=(",", ":"))
+    return int.from_bytes(hashlib.sha256(encoded.encode()).digest(), "big")
+
+
+def normalize_handle(handle: str) -> str:
+    """
+    Normalizes a Discord or X handle for uniqueness checks and lookups
+    """
+    return handle.strip().lstrip("@").lower()
+
+
+def _pack_picks(outcomes: list[str]) -> int:
+    """
+    Packs normalized "yes"/"no" picks, one per bet in order, into a user mask
+    """
+    user_mask = 0
+    for i, outcome in enumerate(outcomes):
+        user_mask |= 1 << (MAX_BETS + i)
+        if outcome == "yes":
+            user_mask |= 1 << i
+    return user_mask
+
+
+def _unpack_pick(
+    mask: int, bet_index: int, check_participation: bool = False
+) -> str | None:
+    """
+    Returns the "yes"/"no" pick stored for a bet in a packed mask, or None
+    when participation is checked and the player did not bet on it
+    """
+    if check_participation and not (mask >> (MAX_BETS + bet_index)) & 1:
+        return None
+    return "yes" if (mask >> bet_index) & 1 else "no"
+
+
+def parse_resolution_date(resolution_date: str) -> int:
+    """
+    Parses a YYYY-MM-DD resolution date into epoch seconds (UTC midnight)
+    """
+    error = f"Invalid resolution date: {resolution_date}. Must be in YYYY-MM-DD format"
+    try:
+        parsed_date = datetime.strptime(resolution_date, "%Y-%m-%d")
+    except ValueError:
+        raise Exception(error)
+    timestamp = int(parsed_date.replace(tzinfo=timezone.utc).timestamp())
+    # Timestamps are stored unsigned, so dates before 1970 cannot be kept
+    if timestamp < 0:
+        raise Exception(error)
+    return timestamp
+
+
+def format_resolution_date(resolution_timestamp: int) -> str:
+    return datetime.fromtimestamp(resolution_timestamp, timezone.utc).strftime(
+        "%Y-%m-%d"
+    )
+
+
+class SourceCache:
+    """
+    Per-execution cache of resolution sources, keyed by normalized URL, so each
+    distinct webpage or X request is fetched once per transaction
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key: str, fetch: typing.Callable[[], typing.Any]) -> typing.Any:
+        if key not in self._entries:
+            self._entries[key] = fetch()
+        return self._entries[key]
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL for cache lookups: lowercase scheme and host, no fragment
+    and query parameters in sorted order
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.urlencode(
+        sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True))
+    )
+    return urllib.parse.urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+    )
+
+
+def _keywords(text: str) -> set[str]:
+    return {
+        word
+        for word in re.findall(r"[a-z0-9]+", text.lower())
+        if word.isdigit() or (len(word) > 2 and word not in STOPWORDS)
+    }
+
+
+def trim_content(content: str, query: str, budget: int) -> str:
+    """
+    Bounds web content to `budget` characters, separators included, by keeping
+    the windows that share the most keywords with `query`, in their original
+    order. Budgets are at least `CONTENT_WINDOW_SIZE`, see `set_bet_content_budget`.
+    """
+    if len(content) <= budget:
+        return content
+
+    windows = [
+        content[start : start + CONTENT_WINDOW_SIZE]
+        for start in range(0, len(content), CONTENT_WINDOW_SIZE)
+    ]
+    keywords = _keywords(query)
+
+    def score(window: str) -> int:
+        words = re.findall(r"[a-z0-9]+", window.lower())
+        return sum(1 for word in words if word in keywords)
+
+    # Highest scores first, earlier windows win ties
+    ranked = sorted(range(len(windows)), key=lambda i: (-score(windows[i]), i))
+    window_count = (budget + len(CONTENT_WINDOW_SEPARATOR)) // (
+        CONTENT_WINDOW_SIZE + len(CONTENT_WINDOW_SEPARATOR)
+    )
+    kept = sorted(ranked[: max(window_count, 1)])
+    return CONTENT_WINDOW_SEPARATOR.join(windows[i] for i in kept)
+
+
+def _fetch_x_data(source: dict, cache: SourceCache | None = None) -> dict:
+    resolution_x_method = source["resolution_x_method"]
+    resolution_x_parameter = source["resolution_x_parameter"]
+
+    if resolution_x_method == "get_user_latest_tweets":
+        if not resolution_x_parameter:
             raise Exception(
-                f"Invalid outcome for bet 2: {bet_2_outcome}. Must be 'yes' or 'no'"
+                "X API method 'get_user_latest_tweets' requires user handle parameter"
             )
+        return get_user_latest_tweets(resolution_x_parameter, cache)
+    if resolution_x_method == "get_tweet_data":
+        if not resolution_x_parameter:
+            raise Exception("X API method 'get_tweet_data' requires tweet ID parameter")
+        return get_tweet_data(resolution_x_parameter, cache)
+    raise Exception(f"Unknown X API method: {resolution_x_method}")
 
-        self.x_handlers[user_address] = user_x_handler
-        self.discord_handlers[user_address] = user_discord_handler
-        self.user_bets[user_address] = [
-            bet_0_outcome.lower(),
-            bet_1_outcome.lower(),
-            bet_2_outcome.lower(),
-        ]
+
+def _fetch_webpage(source: dict, cache: SourceCache | None = None) -> str:
+    resolution_url = source["resolution_url"]
+    if not resolution_url:
+        raise Exception("No resolution URL or valid X API method provided")
+
+    if cache is None:
+        return gl.get_webpage(resolution_url, mode="text")
+    return cache.get(
+        normalize_url(resolution_url),
+        lambda: gl.get_webpage(resolution_url, mode="text"),
+    )
+
+
+def _uses_x_api(source: dict) -> bool:
+    # X API methods are only used when no resolution URL is given
+    return not source["resolution_url"] and bool(source["resolution_x_method"])
+
+
+def _fetch_resolution_data(source: dict, cache: SourceCache | None = None) -> str:
+    """
+    Fetches the content used to resolve a bet, from X when an X API method is
+    set and no URL is given, or from the resolution URL otherwise
+    """
+    if _uses_x_api(source):
+        return json.dumps(_fetch_x_data(source, cache), separators=(",", ":"))
+    return _fetch_webpage(source, cache)
+
+
+def _fetch_rule_payload(
+    source: dict, cache: SourceCache | None = None
+) -> typing.Any:
+    """
+    Fetches the JSON payload a resolution rule is evaluated against: the
+    projected X payload, or the resolution URL content parsed as JSON
+    """
+    if _uses_x_api(source):
+        return _fetch_x_data(source, cache)
+    return json.loads(_fetch_webpage(source, cache))
+
+
+def evaluate_rule(
+    payload: typing.Any, path: str, comparator: str, threshold: str
+) -> dict:
+    """
+    Resolves a bet deterministically by comparing the number found at `path`
+    (dot separated keys and list indexes, e.g. "data.public_metrics.like_count")
+    in the payload against the threshold
+    """
+    value = payload
+    for key in path.split("."):
+        if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        elif isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            raise Exception(f"Path {path} not found in the resolution payload")
+
+    try:
+        number = Decimal(str(value))
+    except InvalidOperation:
+        raise Exception(f"Value at {path} is not a number: {value}")
+
+    holds = RULE_COMPARATORS[comparator](number, Decimal(threshold))
+    negation = "" if holds else "not "
+    return {
+        "outcome": "yes" if holds else "no",
+        "reason": f"{path} is {value}, {negation}{comparator} {threshold}",
+    }
+
+
+def _classify_bet(
+    source: dict, web_data: str, timings: "PhaseTimings | None" = None
+) -> dict:
+    """
+    Asks the LLM to resolve a bet from the fetched web content
+    """
+    timings = timings or PhaseTimings()
+    with timings.phase("prompt_build"):
+        task = _classification_prompt(source, web_data)
+    with timings.phase("llm"):
+        result = gl.exec_prompt(task)
+    with timings.phase("parse"):
+        verdict = json.loads(result.replace("```json", "").replace("```", ""))
+    log_event(
+        "bet_classified", bet_id=source["id"], prompt_chars=len(task), result=result
+    )
+    return verdict
+
+
+def _classification_prompt(source: dict, web_data: str) -> str:
+    return f"""
+In the following web content, you need to resolve a bet about {source["title"]}: {source["description"]}
+
+The possible outcomes are: ["yes", "no"]
+
+Web content:
+{web_data}
+
+Respond in JSON:
+{{
+    "outcome": str, // This should be one of the possible outcomes. e.g., "yes" or "no" 
+    "reason": str, // This should be a short explanation of why you chose the outcome. e.g., "The new AI model is expected to be released by June 20"
+}}
+It is mandatory that you respond only using the JSON format above,
+nothing else. Don't include any other words or characters,
+your output must be only JSON without any formatting prefix or suffix.
+This result should be perfectly parsable by a JSON parser without errors.
+        """
+
+
+def _evidence_prompt(source: dict, web_data: str) -> str:
+    return f"""
+In the following web content, you need to resolve a bet about {source["title"]}: {source["description"]}
+
+The possible outcomes are: ["yes", "no"]
+
+Web content:
+{web_data}
+
+Respond in JSON:
+{{
+    "outcome": str, // "yes" or "no"
+    "reason": str, // A short explanation of why you chose the outcome
+    "evidence": str // The sentence of the web content that decides the outcome, copied exactly, at most {EVIDENCE_MAX_CHARS} characters
+}}
+It is mandatory that you respond only using the JSON format above,
+nothing else. Don't include any other words or characters,
+your output must be only JSON without any formatting prefix or suffix.
+This result should be perfectly parsable by a JSON parser without errors.
+        """
+
+
+def _agreement_prompt(source: dict, verdict: dict) -> str:
+    return f"""
+A bet asks: {source["title"]}: {source["description"]}
+
+This excerpt was quoted from the bet's resolution source:
+"{verdict["evidence"]}"
+
+Does the excerpt show that the answer to the bet is "{verdict["outcome"]}"?
+Answer only "yes" or "no".
+        """
+
+
+def _normalize_excerpt(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _is_valid_evidence(content: str, verdict: typing.Any) -> bool:
+    # Deterministic part of the evidence check: shape, size and quotation
+    return (
+        isinstance(verdict, dict)
+        and verdict.get("outcome") in VALID_OUTCOMES
+        and isinstance(verdict.get("reason"), str)
+        and isinstance(verdict.get("evidence"), str)
+        and 0 < len(verdict["evidence"].strip()) <= EVIDENCE_MAX_CHARS
+        and _normalize_excerpt(verdict["evidence"]) in _normalize_excerpt(content)
+    )
 
 
-def get_user_latest_tweets(user_handle: str) -> dict:
+def _collect_evidence(
+    source: dict, content: str, timings: "PhaseTimings | None" = None
+) -> dict:
+    """
+    Leader side of the evidence mode: classifies a bet and quotes the excerpt
+    of its source that decides it
+    """
+    timings = timings or PhaseTimings()
+    with timings.phase("prompt_build"):
+        task = _evidence_prompt(
+            source,
+            trim_content(
+                content,
+                f"{source['title']} {source['description']}",
+                source["content_budget"],
+            ),
+        )
+    with timings.phase("llm"):
+        result = gl.exec_prompt(task)
+    with timings.phase("parse"):
+        verdict = json.loads(result.replace("```json", "").replace("```", ""))
+        verdict = {
+            "outcome": str(verdict.get("outcome", "")).strip().lower(),
+            "reason": verdict.get("reason", ""),
+            "evidence": verdict.get("evidence", ""),
+        }
+    log_event("evidence_collected", bet_id=source["id"], result=result)
+    if not _is_valid_evidence(content, verdict):
+        raise Exception(f"No valid evidence for bet {source['id']}")
+    return verdict
+
+
+def _check_evidence(
+    source: dict,
+    content: str,
+    verdict: typing.Any,
+    timings: "PhaseTimings | None" = None,
+) -> bool:
+    """
+    Validator side of the evidence mode: the excerpt must be quoted from the
+    source and a short prompt must agree that it supports the outcome
+    """
+    timings = timings or PhaseTimings()
+    with timings.phase("parse"):
+        if not _is_valid_evidence(content, verdict):
+            return False
+    with timings.phase("llm"):
+        answer = gl.exec_prompt(_agreement_prompt(source, verdict))
+    return answer.strip().strip('".').lower() == "yes"
+
+
+class PhaseTimings:
+    """
+    Accumulates wall time per phase of the non-deterministic block
+    """
+
+    def __init__(self):
+        self.seconds: dict[str, float] = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+
+    def as_ms(self) -> dict[str, int]:
+        return {
+            f"{name}_ms": round(seconds * 1000)
+            for name, seconds in self.seconds.items()
+        }
+
+
+def log_event(event: str, **fields: typing.Any) -> None:
+    """
+    Prints one JSON log line. String values longer than `LOG_VALUE_LIMIT` are
+    cut, so fetched pages and LLM outputs never flood the node logs.
+    """
+    entry = {"event": event}
+    for name, value in fields.items():
+        if isinstance(value, str) and len(value) > LOG_VALUE_LIMIT:
+            value = f"{value[:LOG_VALUE_LIMIT]}...[{len(value)} chars]"
+        entry[name] = value
+    print(json.dumps(entry, separators=(",", ":")))
+
+
+def get_user_latest_tweets(user_handle: str, cache: SourceCache | None = None) -> dict:
     """
     Get the latest tweets from a user using the Twitter API recent search endpoint
     """
@@ -375,11 +1919,12 @@ def get_user_latest_tweets(user_handle: str) -> dict:
             "tweet.fields": "text,public_metrics",
             "sort_order": "recency",
         },
+        cache,
     )
     return tweet_data
 
 
-def get_tweet_data(tweet_id: str) -> dict:
+def get_tweet_data(tweet_id: str, cache: SourceCache | None = None) -> dict:
     """
     Get the tweet data in 1 call using the /tweet/{tweet_id} API
     NOTE: /tweet/{tweet_id} has low rate limit
@@ -389,24 +1934,58 @@ def get_tweet_data(tweet_id: str) -> dict:
         {
             "tweet.fields": "text,public_metrics",
         },
+        cache,
     )
     return tweet_data
 
 
+def project_x_payload(payload: typing.Any) -> typing.Any:
+    """
+    Keeps only the tweet fields markets are resolved from (see `X_TWEET_FIELDS`)
+    and the error messages, dropping includes, metadata and everything else
+    """
+    if not isinstance(payload, dict):
+        return payload
+
+    def project(item: typing.Any, fields: tuple[str, ...]) -> typing.Any:
+        if not isinstance(item, dict):
+            return item
+        return {field: item[field] for field in fields if field in item}
+
+    projected = {}
+    data = payload.get("data")
+    if isinstance(data, list):
+        projected["data"] = [project(tweet, X_TWEET_FIELDS) for tweet in data]
+    elif data is not None:
+        projected["data"] = project(data, X_TWEET_FIELDS)
+    if payload.get("errors"):
+        projected["errors"] = [
+            project(error, X_ERROR_FIELDS) for error in payload["errors"]
+        ]
+    # Objects that are not shaped like an X API response are kept as they are
+    return projected if projected else payload
+
+
 def request_to_x(
-    endpoint: str, params: dict[typing.Any, typing.Any]
+    endpoint: str,
+    params: dict[typing.Any, typing.Any],
+    cache: SourceCache | None = None,
 ) -> dict[str, typing.Any]:
     proxy_url = "https://d-kol.vercel.app/api/twitter"
     base_url = f"{proxy_url}/{endpoint}"
 
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
+    # Sorted parameters give every validator the same URL and cache key
+    url = f"{base_url}?{urllib.parse.urlencode(sorted(params.items()))}"
 
     def call_x_api() -> dict[str, typing.Any]:
-        print(f"Requesting {url}")
         web_data = gl.get_webpage(url, mode="text")
-        print(f"Response: '{web_data}'")
         # TODO: improve this to handle case when response is not a json
         # TODO: improve proxy server to return json in failure cases
-        return json.loads(web_data)
+        # Validators compare the projected payload, not the full response
+        return project_x_payload(json.loads(web_data))
 
-    return gl.eq_principle_strict_eq(call_x_api)
+    if cache is None:
+        return gl.eq_principle_strict_eq(call_x_api)
+    # Only the agreed strict equality result is cached, so reusing it for
+    # other bets cannot diverge between validators
+    return cache.get(url, lambda: gl.eq_principle_strict_eq(call_x_api))
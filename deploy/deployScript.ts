@@ -38,80 +38,72 @@ export default async function main(client: GenLayerClient<any>) {
 
     console.log("\nCreating initial bets...");
 
-    // Bet 1: FIFA World Cup - PSG vs. Atletico Madrid
-    console.log("Creating Bet 1: Testnet Announcement Video Likes");
-    const bet1Hash = await client.writeContract({
-      address: contractAddress,
-      functionName: "create_bet",
-      args: [
-        "testnet_announcement_video_likes",
-        "2025-07-10",
-        "",
-        "get_tweet_data",
-        "1935668887577632966",
-        "More than 700 likes on the testnet announcement video",
-        "Will the testnet announcement video reach more than 700 likes until July 10th?",
-        "Community",
-      ],
-      value: 0n,
-    });
-
-    await client.waitForTransactionReceipt({
-      hash: bet1Hash as TransactionHash,
-      status: TransactionStatus.ACCEPTED,
-      retries: 200,
-    });
-    console.log("✓ Bet 1 created successfully");
+    const initialBets = [
+      {
+        bet_id: "testnet_announcement_video_likes",
+        resolution_date: "2025-07-10",
+        resolution_x_method: "get_tweet_data",
+        resolution_x_parameter: "1935668887577632966",
+        title: "More than 700 likes on the testnet announcement video",
+        description:
+          "Will the testnet announcement video reach more than 700 likes until July 10th?",
+        category: "Community",
+      },
+      {
+        bet_id: "new_ai_model_surpass_o3",
+        resolution_date: "2025-07-10",
+        resolution_url: "https://artificialanalysis.ai/leaderboards/models",
+        title: "New AI Model Surpassing OpenAI's o3",
+        description:
+          "Will any provider release an AI model with a score higher than 71 on the Artificial Intelligence Index according to artificialanalysis.ai/#artificial-analysis-intelligence-index before July 10th surpassing OpenAI's o3 pro model?",
+        category: "AI",
+      },
+      {
+        bet_id: "genlayer_ama_375_members",
+        resolution_date: "2025-07-10",
+        resolution_x_method: "get_user_latest_tweets",
+        resolution_x_parameter: "Cryptony09",
+        title: "Genlayer AMA Membership Milestone",
+        description:
+          "Will one Genlayer AMA surpass more than 375 members according to @Cryptony09's post from X?",
+        category: "Community",
+      },
+    ];
 
-    // Bet 2: AI Model with higher intelligence than OpenAI's o3
-    console.log("Creating Bet 2: New AI Model Surpassing OpenAI's o3");
-    const bet2Hash = await client.writeContract({
+    // All bets are created in a single transaction, a bad entry aborts it
+    const createBetsHash = await client.writeContract({
       address: contractAddress,
-      functionName: "create_bet",
-      args: [
-        "new_ai_model_surpass_o3",
-        "2025-07-10",
-        "https://artificialanalysis.ai/leaderboards/models",
-        "",
-        "",
-        "New AI Model Surpassing OpenAI's o3",
-        "Will any provider release an AI model with a score higher than 71 on the Artificial Intelligence Index according to artificialanalysis.ai/#artificial-analysis-intelligence-index before July 10th surpassing OpenAI's o3 pro model?",
-        "AI",
-      ],
+      functionName: "create_bets",
+      args: [JSON.stringify(initialBets), false],
       value: 0n,
     });
 
     await client.waitForTransactionReceipt({
-      hash: bet2Hash as TransactionHash,
+      hash: createBetsHash as TransactionHash,
       status: TransactionStatus.ACCEPTED,
       retries: 200,
     });
-    console.log("✓ Bet 2 created successfully");
+    console.log(`✓ ${initialBets.length} bets created successfully`);
 
-    // Bet 3: Genlayer AMA membership
-    console.log("Creating Bet 3: Genlayer AMA Membership Milestone");
-    const bet3Hash = await client.writeContract({
+    // The likes bet asks a numeric question, so it is resolved by a deterministic rule
+    const ruleHash = await client.writeContract({
       address: contractAddress,
-      functionName: "create_bet",
+      functionName: "set_bet_rule",
       args: [
-        "genlayer_ama_375_members",
-        "2025-07-10",
-        "",
-        "get_user_latest_tweets",
-        "Cryptony09",
-        "Genlayer AMA Membership Milestone",
-        "Will one Genlayer AMA surpass more than 375 members according to @Cryptony09's post from X?",
-        "Community",
+        "testnet_announcement_video_likes",
+        "data.public_metrics.like_count",
+        ">",
+        "700",
       ],
       value: 0n,
     });
 
     await client.waitForTransactionReceipt({
-      hash: bet3Hash as TransactionHash,
+      hash: ruleHash as TransactionHash,
       status: TransactionStatus.ACCEPTED,
       retries: 200,
     });
-    console.log("✓ Bet 3 created successfully");
+    console.log("✓ Likes bet resolution rule set successfully");
 
     console.log("\n🎉 All initial bets created successfully!");
     console.log("Contract is ready for users to place their bets!");
@@ -0,0 +1,69 @@
+"""
+Gateway to a deployed GenLayerBets contract, shared by the resolution
+scheduler, the indexer and the migration.
+"""
+
+
+class ContractGateway:
+    """
+    Blocking calls to the GenLayerBets contract used by the off-chain services
+    """
+
+    def __init__(self, client, contract_address: str):
+        self.client = client
+        self.contract_address = contract_address
+
+    def get_resolvable_bets(self, now: int, limit: int) -> list[str]:
+        return self.client.read_contract(
+            address=self.contract_address,
+            function_name="get_resolvable_bets",
+            args=[now, limit],
+        )
+
+    def get_state_chunk(self, cursor: int, max_items: int) -> dict:
+        return self.client.read_contract(
+            address=self.contract_address,
+            function_name="get_state_chunk",
+            args=[cursor, max_items],
+        )
+
+    def get_bets(self) -> list[dict]:
+        return self.client.read_contract(
+            address=self.contract_address,
+            function_name="get_bets",
+            args=[],
+        )
+
+    def get_all_user_bets(self) -> dict:
+        return self.client.read_contract(
+            address=self.contract_address,
+            function_name="get_all_user_bets",
+            args=[],
+        )
+
+    def resolve_bet(self, bet_id: str) -> str:
+        return self._write("resolve_bet", [bet_id])
+
+    def create_bets(self, bets_json: str) -> str:
+        return self._write("create_bets", [bets_json, False])
+
+    def migrate_resolutions(self, resolutions: list[list[str]]) -> str:
+        return self._write("migrate_resolutions", [resolutions])
+
+    def migrate_user_bets(self, records: list[list[str]]) -> str:
+        return self._write("migrate_user_bets", [records])
+
+    def get_transaction(self, transaction_hash: str) -> dict:
+        return self.client.get_transaction(transaction_hash=transaction_hash)
+
+    def wait_for_transaction(self, transaction_hash: str) -> dict:
+        return self.client.wait_for_transaction_receipt(
+            transaction_hash=transaction_hash
+        )
+
+    def _write(self, function_name: str, args: list) -> str:
+        return self.client.write_contract(
+            address=self.contract_address,
+            function_name=function_name,
+            args=args,
+        )
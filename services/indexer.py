@@ -0,0 +1,443 @@
+"""
+Off-chain indexer for the GenLayerBets contract.
+
+Streams the contract state with `get_state_chunk` and mirrors it into SQL
+tables matching the Prisma `Bet`, `User` and `UserBet` models. Each chunk is
+diffed against the row digests of the last sync and only the changed rows are
+written, as one batch of upserts per chunk, so memory stays bounded by the
+chunk size. A cycle is skipped entirely while the contract's state digest is
+unchanged. SQLite stands in for Postgres locally.
+
+Usage:
+    python -m services.indexer --database indexer.sqlite3 --chunk-size 500
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from dataclasses import astuple, dataclass
+from datetime import datetime, timezone
+from typing import Iterator
+
+from genlayer_py import create_client
+from genlayer_py.chains import localnet
+
+from config.genlayer_config import get_config, get_rpc_url
+from services.gateway import ContractGateway
+
+logger = logging.getLogger(__name__)
+
+# Same pick packing as contracts/genlayer_bets.py: bit `i` holds the pick for
+# bet `i` (1 = "yes") and bit `MAX_BETS + i` marks participation
+MAX_BETS = 128
+VALID_OUTCOMES = ("yes", "no")
+STATE_DIGEST_MODULUS = 1 << 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS "Bet" (
+    "id" TEXT PRIMARY KEY,
+    "betId" TEXT NOT NULL UNIQUE,
+    "title" TEXT NOT NULL,
+    "description" TEXT NOT NULL,
+    "category" TEXT NOT NULL,
+    "resolutionDate" TEXT NOT NULL,
+    "resolutionUrl" TEXT,
+    "resolutionXMethod" TEXT,
+    "resolutionXParameter" TEXT,
+    "createdAt" TEXT NOT NULL,
+    "updatedAt" TEXT NOT NULL,
+    "resolved" BOOLEAN NOT NULL DEFAULT 0,
+    "resolvedOutcome" TEXT,
+    "resolvedReason" TEXT
+);
+CREATE TABLE IF NOT EXISTS "User" (
+    "id" TEXT PRIMARY KEY,
+    "address" TEXT NOT NULL UNIQUE,
+    "discordHandle" TEXT UNIQUE,
+    "xHandle" TEXT UNIQUE,
+    "points" INTEGER NOT NULL DEFAULT 0,
+    "createdAt" TEXT NOT NULL,
+    "updatedAt" TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS "UserBet" (
+    "id" TEXT PRIMARY KEY,
+    "userId" TEXT NOT NULL REFERENCES "User" ("id"),
+    "betId" TEXT NOT NULL REFERENCES "Bet" ("id"),
+    "selectedOutcome" TEXT NOT NULL,
+    "createdAt" TEXT NOT NULL,
+    UNIQUE ("userId", "betId")
+);
+-- Digest of each mirrored row as of the last sync, used to skip unchanged rows
+CREATE TABLE IF NOT EXISTS "IndexerRow" (
+    "key" TEXT PRIMARY KEY,
+    "digest" TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS "IndexerState" (
+    "key" TEXT PRIMARY KEY,
+    "value" TEXT NOT NULL
+);
+"""
+
+UPSERT_BET = """
+INSERT INTO "Bet" (
+    "id", "betId", "title", "description", "category", "resolutionDate",
+    "resolutionUrl", "resolutionXMethod", "resolutionXParameter",
+    "createdAt", "updatedAt", "resolved", "resolvedOutcome", "resolvedReason"
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT ("betId") DO UPDATE SET
+    "title" = excluded."title",
+    "description" = excluded."description",
+    "category" = excluded."category",
+    "resolutionDate" = excluded."resolutionDate",
+    "resolutionUrl" = excluded."resolutionUrl",
+    "resolutionXMethod" = excluded."resolutionXMethod",
+    "resolutionXParameter" = excluded."resolutionXParameter",
+    "updatedAt" = excluded."updatedAt",
+    "resolved" = excluded."resolved",
+    "resolvedOutcome" = excluded."resolvedOutcome",
+    "resolvedReason" = excluded."resolvedReason"
+"""
+
+UPSERT_USER = """
+INSERT INTO "User" (
+    "id", "address", "discordHandle", "xHandle", "points", "createdAt",
+    "updatedAt"
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT ("address") DO UPDATE SET
+    "discordHandle" = excluded."discordHandle",
+    "xHandle" = excluded."xHandle",
+    "points" = excluded."points",
+    "updatedAt" = excluded."updatedAt"
+"""
+
+UPSERT_USER_BET = """
+INSERT INTO "UserBet" ("id", "userId", "betId", "selectedOutcome", "createdAt")
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT ("userId", "betId") DO UPDATE SET
+    "selectedOutcome" = excluded."selectedOutcome"
+"""
+
+
+def row_digest(row: list) -> str:
+    encoded = json.dumps(row, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def decode_picks(picks: str, bet_count: int) -> dict[int, str]:
+    """
+    Unpacks a player's hex picks mask into {bet position: "yes" | "no"}
+    """
+    mask = int(picks, 16)
+    return {
+        i: "yes" if (mask >> i) & 1 else "no"
+        for i in range(bet_count)
+        if (mask >> (MAX_BETS + i)) & 1
+    }
+
+
+@dataclass
+class Bet:
+    id: str
+    resolution_timestamp: int
+    has_resolved: bool
+    resolution_url: str
+    resolution_x_method: str
+    resolution_x_parameter: str
+    title: str
+    description: str
+    category: str
+    outcome: str
+    reason: str
+
+
+@dataclass
+class SyncStats:
+    bets: int = 0
+    users: int = 0
+    user_bets: int = 0
+    unchanged: int = 0
+    skipped: bool = False
+    verified: bool = False
+
+
+class SQLiteMirror:
+    """
+    The Prisma tables in SQLite, plus the indexer's row digests and state
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.connection.executescript(SCHEMA)
+
+    def get_state(self, key: str) -> str | None:
+        row = self.connection.execute(
+            'SELECT "value" FROM "IndexerState" WHERE "key" = ?', (key,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def set_state(self, key: str, value: str) -> None:
+        self.connection.execute(
+            'INSERT INTO "IndexerState" ("key", "value") VALUES (?, ?) '
+            'ON CONFLICT ("key") DO UPDATE SET "value" = excluded."value"',
+            (key, value),
+        )
+
+    def get_digests(self, keys: list[str]) -> dict[str, str]:
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        return dict(
+            self.connection.execute(
+                'SELECT "key", "digest" FROM "IndexerRow" '
+                f'WHERE "key" IN ({placeholders})',
+                keys,
+            )
+        )
+
+    def set_digests(self, digests: dict[str, str]) -> None:
+        self.connection.executemany(
+            'INSERT INTO "IndexerRow" ("key", "digest") VALUES (?, ?) '
+            'ON CONFLICT ("key") DO UPDATE SET "digest" = excluded."digest"',
+            digests.items(),
+        )
+
+    def get_bet_row_ids(self) -> dict[str, str]:
+        return dict(self.connection.execute('SELECT "betId", "id" FROM "Bet"'))
+
+    def upsert_bets(self, bets: list[Bet], now: str) -> None:
+        self.connection.executemany(
+            UPSERT_BET,
+            [
+                (
+                    str(uuid.uuid4()),
+                    bet.id,
+                    bet.title,
+                    bet.description,
+                    bet.category,
+                    datetime.fromtimestamp(
+                        bet.resolution_timestamp, timezone.utc
+                    ).strftime("%Y-%m-%d"),
+                    bet.resolution_url or None,
+                    bet.resolution_x_method or None,
+                    bet.resolution_x_parameter or None,
+                    now,
+                    now,
+                    bet.has_resolved,
+                    bet.outcome or None,
+                    bet.reason or None,
+                )
+                for bet in bets
+            ],
+        )
+
+    def upsert_users(self, users: list[tuple], now: str) -> dict[str, str]:
+        """
+        Upserts (address, discord, x, points) rows, returns their row ids
+        """
+        self.connection.executemany(
+            UPSERT_USER,
+            [
+                (
+                    str(uuid.uuid4()),
+                    address,
+                    discord or None,
+                    x or None,
+                    points,
+                    now,
+                    now,
+                )
+                for address, discord, x, points in users
+            ],
+        )
+        addresses = [user[0] for user in users]
+        placeholders = ", ".join("?" for _ in addresses)
+        return dict(
+            self.connection.execute(
+                'SELECT "address", "id" FROM "User" '
+                f'WHERE "address" IN ({placeholders})',
+                addresses,
+            )
+        )
+
+    def upsert_user_bets(self, user_bets: list[tuple], now: str) -> None:
+        """
+        Upserts (user row id, bet row id, selected outcome) rows
+        """
+        self.connection.executemany(
+            UPSERT_USER_BET,
+            [
+                (str(uuid.uuid4()), user_id, bet_id, outcome, now)
+                for user_id, bet_id, outcome in user_bets
+            ],
+        )
+
+
+class Indexer:
+    def __init__(
+        self,
+        gateway: ContractGateway,
+        mirror: SQLiteMirror,
+        chunk_size: int = 500,
+    ):
+        self.gateway = gateway
+        self.mirror = mirror
+        self.chunk_size = chunk_size
+
+    def stream_chunks(self) -> Iterator[dict]:
+        cursor = 0
+        while cursor is not None:
+            chunk = self.gateway.get_state_chunk(cursor, self.chunk_size)
+            yield chunk
+            cursor = chunk["next_cursor"]
+
+    def sync_once(self) -> SyncStats:
+        """
+        Mirrors the changes since the last sync, one transaction per chunk
+        """
+        stats = SyncStats()
+        bets: list[Bet] = []
+        bet_row_ids: dict[str, str] = {}
+        digest = 0
+        state_seqs = set()
+
+        for chunk in self.stream_chunks():
+            if not state_seqs and chunk["state_digest"] == self.mirror.get_state(
+                "state_digest"
+            ):
+                stats.skipped = stats.verified = True
+                return stats
+            state_seqs.add(chunk["state_seq"])
+            digest = (digest + int(chunk["chunk_digest"], 16)) % STATE_DIGEST_MODULUS
+            now = datetime.now(timezone.utc).isoformat()
+
+            with self.mirror.connection:
+                # Bets come first and are bounded by the contract's MAX_BETS,
+                # so they are all kept to decode the players' picks
+                if chunk["bets"]:
+                    chunk_bets = [Bet(*item) for item in chunk["bets"]]
+                    bets.extend(chunk_bets)
+                    self._sync_bets(chunk_bets, now, stats)
+                if chunk["players"]:
+                    if not bet_row_ids:
+                        bet_row_ids = self.mirror.get_bet_row_ids()
+                    self._sync_players(chunk["players"], bets, bet_row_ids, now, stats)
+
+        stats.verified = len(state_seqs) == 1 and digest == int(
+            chunk["state_digest"], 16
+        )
+        if stats.verified:
+            with self.mirror.connection:
+                self.mirror.set_state("state_digest", chunk["state_digest"])
+        else:
+            # The state changed while streaming, the next cycle catches up
+            logger.warning("State changed during the sync, it will be retried")
+        return stats
+
+    def _changed(self, rows: dict[str, list], stats: SyncStats) -> dict[str, str]:
+        """
+        Returns the digests of the rows that differ from the last sync
+        """
+        digests = {key: row_digest(row) for key, row in rows.items()}
+        known = self.mirror.get_digests(list(digests))
+        changed = {
+            key: value for key, value in digests.items() if known.get(key) != value
+        }
+        stats.unchanged += len(digests) - len(changed)
+        return changed
+
+    def _sync_bets(self, bets: list[Bet], now: str, stats: SyncStats) -> None:
+        changed = self._changed(
+            {f"bet:{bet.id}": list(astuple(bet)) for bet in bets}, stats
+        )
+        if not changed:
+            return
+        self.mirror.upsert_bets(
+            [bet for bet in bets if f"bet:{bet.id}" in changed], now
+        )
+        self.mirror.set_digests(changed)
+        stats.bets += len(changed)
+
+    def _sync_players(
+        self,
+        players: list[list],
+        bets: list[Bet],
+        bet_row_ids: dict[str, str],
+        now: str,
+        stats: SyncStats,
+    ) -> None:
+        rows = {}
+        users = {}
+        for address, discord, x, picks in players:
+            address = address.lower()
+            selections = decode_picks(picks, len(bets))
+            # Points only move when a bet the player picked is resolved
+            outcomes = {
+                i: bets[i].outcome for i in selections if bets[i].has_resolved
+            }
+            points = sum(
+                1
+                for i, outcome in outcomes.items()
+                if outcome in VALID_OUTCOMES and selections[i] == outcome
+            )
+            key = f"user:{address}"
+            rows[key] = [address, discord, x, picks, sorted(outcomes.items())]
+            users[key] = (address, discord, x, points, selections)
+
+        changed = self._changed(rows, stats)
+        if not changed:
+            return
+        user_rows = [users[key][:4] for key in changed]
+        user_row_ids = self.mirror.upsert_users(user_rows, now)
+        self.mirror.upsert_user_bets(
+            [
+                (user_row_ids[address], bet_row_ids[bets[i].id], outcome)
+                for address, _, _, _, selections in (users[key] for key in changed)
+                for i, outcome in selections.items()
+            ],
+            now,
+        )
+        self.mirror.set_digests(changed)
+        stats.users += len(user_rows)
+        stats.user_bets += sum(len(users[key][4]) for key in changed)
+
+    def run(self, poll_interval: float) -> None:
+        while True:
+            try:
+                stats = self.sync_once()
+                logger.info("Sync finished: %s", stats)
+            except Exception:
+                logger.exception("Sync failed")
+            time.sleep(poll_interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database", default="indexer.sqlite3")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--poll-interval", type=float, default=30.0)
+    parser.add_argument("--once", action="store_true", help="Sync once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = get_config()
+    if not config["contract_address"]:
+        raise SystemExit("CONTRACT_ADDRESS must be set")
+
+    client = create_client(chain=localnet, endpoint=get_rpc_url(config))
+    indexer = Indexer(
+        ContractGateway(client, config["contract_address"]),
+        SQLiteMirror(sqlite3.connect(args.database)),
+        chunk_size=args.chunk_size,
+    )
+    if args.once:
+        logger.info("Sync finished: %s", indexer.sync_once())
+    else:
+        indexer.run(args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
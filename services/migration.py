@@ -0,0 +1,153 @@
+"""
+Migration of a season in progress to a new GenLayerBets deployment.
+
+Reads the bets and picks of the previous deployment and replays them on the
+new one: the bets are created in the same order, the resolved outcomes are
+copied and every player is registered with all of their picks, so the points
+earned so far carry over. The new deployment must have no bets yet and must
+not have finished its migration, see `migrate_user_bets`.
+
+Usage:
+    python -m services.migration --source 0xPREVIOUS --batch-size 200
+"""
+
+import argparse
+import json
+import logging
+
+from eth_account import Account
+from genlayer_py import create_client
+from genlayer_py.chains import localnet
+
+from config.genlayer_config import get_config, get_rpc_url
+from services.gateway import ContractGateway
+from services.resolution_scheduler import execution_succeeded
+
+logger = logging.getLogger(__name__)
+
+# `create_bets` fields copied from the `get_bets` entries of the source
+BET_FIELDS = (
+    "resolution_date",
+    "resolution_url",
+    "resolution_x_method",
+    "resolution_x_parameter",
+    "title",
+    "description",
+    "category",
+)
+PACKED_PICKS = {"yes": "y", "no": "n"}
+SKIPPED_PICK = "-"
+
+
+def migration_bets(bets: list[dict]) -> list[dict]:
+    """
+    `create_bets` entries recreating the source bets in the same order
+    """
+    return [
+        {"bet_id": bet["id"], **{field: bet.get(field, "") for field in BET_FIELDS}}
+        for bet in bets
+    ]
+
+
+def migration_resolutions(bets: list[dict]) -> list[list[str]]:
+    """
+    `migrate_resolutions` records of the resolved source bets
+    """
+    return [
+        [bet["id"], bet["outcome"], bet["reason"]]
+        for bet in bets
+        if bet["has_resolved"]
+    ]
+
+
+def migration_records(bets: list[dict], user_bets: dict) -> list[list[str]]:
+    """
+    `migrate_user_bets` records of the source players, from the source
+    `get_all_user_bets` export
+    """
+    bet_positions = {bet["id"]: position for position, bet in enumerate(bets)}
+    records = []
+    for address in user_bets["user_addresses"]:
+        picks = [SKIPPED_PICK] * len(bets)
+        for selection in user_bets["user_bet_selections"][address]:
+            outcome = selection["selected_outcome"].strip().lower()
+            if outcome not in PACKED_PICKS:
+                raise ValueError(
+                    f"Unexpected pick {outcome} of {address} on {selection['bet_id']}"
+                )
+            picks[bet_positions[selection["bet_id"]]] = PACKED_PICKS[outcome]
+        handlers = user_bets["user_handlers"][address]
+        records.append(
+            [
+                address,
+                handlers["discord_handler"],
+                handlers["x_handler"],
+                "".join(picks),
+            ]
+        )
+    return records
+
+
+def migrate(source, target, batch_size: int) -> dict:
+    """
+    Replays the source deployment on the target one and returns the number
+    of bets, resolutions and players copied. Resolutions are copied before
+    the players, so every player starts with a ranked score and no
+    `apply_scores` call is needed.
+    """
+    bets = source.get_bets()
+    user_bets = source.get_all_user_bets()
+    resolutions = migration_resolutions(bets)
+    records = migration_records(bets, user_bets)
+
+    if bets:
+        submit(target, target.create_bets, json.dumps(migration_bets(bets)))
+    if resolutions:
+        submit(target, target.migrate_resolutions, resolutions)
+    for start in range(0, len(records), batch_size):
+        batch = records[start : start + batch_size]
+        submit(target, target.migrate_user_bets, batch)
+        logger.info("Migrated %d of %d players", start + len(batch), len(records))
+    return {
+        "bets": len(bets),
+        "resolutions": len(resolutions),
+        "players": len(records),
+    }
+
+
+def submit(target, write, *args) -> dict:
+    """
+    Sends one write to the target and waits until its execution succeeds
+    """
+    transaction = target.wait_for_transaction(write(*args))
+    if not execution_succeeded(transaction):
+        raise RuntimeError(f"{write.__name__} failed: {transaction}")
+    return transaction
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--source", required=True, help="Previous contract address")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = get_config()
+    if not config["contract_address"] or not config["private_key"]:
+        raise SystemExit("CONTRACT_ADDRESS and PRIVATE_KEY must be set")
+
+    client = create_client(
+        chain=localnet,
+        endpoint=get_rpc_url(config),
+        account=Account.from_key(config["private_key"]),
+    )
+    summary = migrate(
+        ContractGateway(client, args.source),
+        ContractGateway(client, config["contract_address"]),
+        args.batch_size,
+    )
+    logger.info("Migration finished: %s", summary)
+
+
+if __name__ == "__main__":
+    main()
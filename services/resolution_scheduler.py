@@ -0,0 +1,306 @@
+"""
+Resolution scheduler for the GenLayerBets contract.
+
+Polls the contract for due markets and submits `resolve_bet` transactions
+through a bounded pool of asyncio workers, waiting for each receipt with
+exponential backoff and jitter. Submissions from the owner key are
+serialized so every transaction gets its own nonce, only the receipt waits
+run concurrently.
+
+Usage:
+    python -m services.resolution_scheduler --concurrency 4 --metrics-port 9100
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from eth_account import Account
+from genlayer_py import create_client
+from genlayer_py.chains import localnet
+from genlayer_py.types import TransactionStatus
+
+from config.genlayer_config import get_config, get_rpc_url
+from services.gateway import ContractGateway
+
+logger = logging.getLogger(__name__)
+
+# Receipt statuses after which a resolution is no longer waited on. An
+# accepted transaction only resolved its bet if the execution succeeded too.
+ACCEPTED_STATUSES = {TransactionStatus.ACCEPTED, TransactionStatus.FINALIZED}
+FAILURE_STATUSES = {TransactionStatus.CANCELED, TransactionStatus.UNDETERMINED}
+
+
+def execution_succeeded(transaction: dict) -> bool:
+    """
+    Whether the leader's execution of a transaction succeeded, as checked by
+    `gltest.assertions.tx_execution_succeeded`
+    """
+    leader_receipt = (transaction.get("consensus_data") or {}).get(
+        "leader_receipt"
+    ) or {}
+    return leader_receipt.get("execution_result") == "SUCCESS"
+
+
+@dataclass
+class Backoff:
+    """
+    Exponential backoff with jitter: attempt `n` waits between
+    `(1 - jitter)` and 1 times `min(initial * factor ** n, maximum)` seconds
+    """
+
+    initial: float = 1.0
+    factor: float = 2.0
+    maximum: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int, rng: random.Random = random) -> float:
+        ceiling = min(self.initial * self.factor**attempt, self.maximum)
+        return ceiling * rng.uniform(1 - self.jitter, 1)
+
+
+@dataclass
+class SchedulerMetrics:
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    queue_depth: int = 0
+    in_flight: int = 0
+    polls: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def throughput(self) -> float:
+        """
+        Settled resolutions (succeeded or failed) per minute since start
+        """
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) * 60 / elapsed
+
+    def snapshot(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "polls": self.polls,
+            "throughput_per_minute": self.throughput(),
+        }
+
+    def render_prometheus(self) -> str:
+        return "".join(
+            f"genlayer_bets_scheduler_{name} {value}\n"
+            for name, value in self.snapshot().items()
+        )
+
+
+class ResolutionScheduler:
+    def __init__(
+        self,
+        gateway: ContractGateway,
+        concurrency: int = 4,
+        poll_interval: float = 60.0,
+        batch_limit: int = 50,
+        receipt_timeout: float = 600.0,
+        backoff: Backoff | None = None,
+        metrics: SchedulerMetrics | None = None,
+        rng: random.Random | None = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.gateway = gateway
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.batch_limit = batch_limit
+        self.receipt_timeout = receipt_timeout
+        self.backoff = backoff or Backoff()
+        self.metrics = metrics or SchedulerMetrics()
+        self.rng = rng or random.Random()
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        # Bets queued or being resolved, so polls never submit them twice
+        self._pending: set[str] = set()
+        # The client reads the nonce and then sends without locking, so
+        # concurrent submissions from one key could reuse a nonce
+        self._submit_lock = asyncio.Lock()
+
+    async def poll_once(self) -> list[str]:
+        """
+        Queues the due bets that are not already pending, returns them
+        """
+        bet_ids = await asyncio.to_thread(
+            self.gateway.get_resolvable_bets, int(time.time()), self.batch_limit
+        )
+        self.metrics.polls += 1
+        queued = []
+        for bet_id in bet_ids:
+            if bet_id in self._pending:
+                continue
+            self._pending.add(bet_id)
+            self._queue.put_nowait(bet_id)
+            queued.append(bet_id)
+        self.metrics.queue_depth = self._queue.qsize()
+        return queued
+
+    async def wait_for_receipt(self, transaction_hash: str) -> dict:
+        """
+        Polls a transaction until it is accepted or failed, returns it
+        """
+        deadline = time.monotonic() + self.receipt_timeout
+        attempt = 0
+        while True:
+            transaction = await asyncio.to_thread(
+                self.gateway.get_transaction, transaction_hash
+            )
+            status = transaction["status"]
+            if status in ACCEPTED_STATUSES or status in FAILURE_STATUSES:
+                return transaction
+            delay = self.backoff.delay(attempt, self.rng)
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(
+                    f"Transaction {transaction_hash} still {status} after "
+                    f"{self.receipt_timeout}s"
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _resolve(self, bet_id: str) -> None:
+        self.metrics.in_flight += 1
+        try:
+            async with self._submit_lock:
+                transaction_hash = await asyncio.to_thread(
+                    self.gateway.resolve_bet, bet_id
+                )
+            self.metrics.submitted += 1
+            transaction = await self.wait_for_receipt(transaction_hash)
+            status = transaction["status"]
+            if status in ACCEPTED_STATUSES and execution_succeeded(transaction):
+                self.metrics.succeeded += 1
+                logger.info("Resolved bet %s in %s", bet_id, transaction_hash)
+            elif status in ACCEPTED_STATUSES:
+                self.metrics.failed += 1
+                logger.warning(
+                    "Resolution of bet %s ended %s but its execution failed",
+                    bet_id,
+                    status,
+                )
+            else:
+                self.metrics.failed += 1
+                logger.warning("Resolution of bet %s ended %s", bet_id, status)
+        except Exception:
+            # The bet stays unresolved, so the next poll queues it again
+            self.metrics.failed += 1
+            logger.exception("Failed to resolve bet %s", bet_id)
+        finally:
+            self.metrics.in_flight -= 1
+            self._pending.discard(bet_id)
+
+    async def _worker(self) -> None:
+        while True:
+            bet_id = await self._queue.get()
+            self.metrics.queue_depth = self._queue.qsize()
+            try:
+                await self._resolve(bet_id)
+            finally:
+                self._queue.task_done()
+
+    async def drain(self) -> None:
+        """
+        Resolves everything currently queued with the worker pool
+        """
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        try:
+            await self._queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        stop = stop or asyncio.Event()
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        try:
+            while not stop.is_set():
+                try:
+                    await self.poll_once()
+                except Exception:
+                    logger.exception("Polling for resolvable bets failed")
+                logger.info("Scheduler metrics: %s", self.metrics.snapshot())
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+def serve_metrics(metrics: SchedulerMetrics, port: int) -> ThreadingHTTPServer:
+    """
+    Serves the metrics in the Prometheus text format on /metrics
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--poll-interval", type=float, default=60.0)
+    parser.add_argument("--batch-limit", type=int, default=50)
+    parser.add_argument("--receipt-timeout", type=float, default=600.0)
+    parser.add_argument("--metrics-port", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = get_config()
+    if not config["contract_address"] or not config["private_key"]:
+        raise SystemExit("CONTRACT_ADDRESS and PRIVATE_KEY must be set")
+
+    client = create_client(
+        chain=localnet,
+        endpoint=get_rpc_url(config),
+        account=Account.from_key(config["private_key"]),
+    )
+    scheduler = ResolutionScheduler(
+        ContractGateway(client, config["contract_address"]),
+        concurrency=args.concurrency,
+        poll_interval=args.poll_interval,
+        batch_limit=args.batch_limit,
+        receipt_timeout=args.receipt_timeout,
+    )
+    if args.metrics_port:
+        serve_metrics(scheduler.metrics, args.metrics_port)
+    asyncio.run(scheduler.run())
+
+
+if __name__ == "__main__":
+    main()
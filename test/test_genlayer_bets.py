@@ -1,3 +1,5 @@
+import json
+
 from gltest import get_contract_factory, default_account
 from gltest.helpers import load_fixture
 from gltest.assertions import tx_execution_succeeded, tx_execution_failed
@@ -21,162 +23,22 @@ def deploy_contract():
     return contract
 
 
-# def test_create_bet_success():
-#     """Test successful bet creation by owner"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create a bet
-#     create_bet_result = contract.create_bet(
-#         args=[
-#             "test_bet_1",
-#             "2025-06-04",
-#             "https://www.fifa.com/en/match-centre/match/520/288301/288302/400017744?date=2025-06-04",
-#             "Football match between Barbados and Aruba",
-#             "Who will win the match between Barbados and Aruba?",
-#             ["Barbados", "Aruba", "Draw"],
-#         ]
-#     )
-#     assert tx_execution_succeeded(create_bet_result)
-
-#     # Verify bet was created
-#     bets = contract.get_bets(args=[])
-#     assert len(bets) == 1
-#     assert bets[0]["id"] == "test_bet_1"
-#     assert bets[0]["title"] == "Football match between Barbados and Aruba"
-#     assert bets[0]["has_resolved"] == False
-#     assert bets[0]["possible_outcomes"] == ["Barbados", "Aruba", "Draw"]
-
-
-# def test_create_bet_duplicate_id_fails():
-#     """Test that creating a bet with duplicate ID fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create first bet
-#     create_bet_result = contract.create_bet(
-#         args=[
-#             "duplicate_bet",
-#             "2025-06-15",
-#             "https://example.com/resolution",
-#             "First Bet",
-#             "First bet description",
-#             ["Yes", "No"],
-#         ]
-#     )
-#     assert tx_execution_succeeded(create_bet_result)
-
-#     # Try to create bet with same ID - should fail
-#     tx_receipt = contract.create_bet(
-#         args=[
-#             "duplicate_bet",
-#             "2025-06-16",
-#             "https://example.com/resolution2",
-#             "Second Bet",
-#             "Second bet description",
-#             ["Option 1", "Option 2"],
-#         ]
-#     )
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_create_bet_insufficient_outcomes_fails():
-#     """Test that creating a bet with less than 2 outcomes fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Try to create bet with only 1 outcome - should fail
-#     tx_receipt = contract.create_bet(
-#         args=[
-#             "single_outcome_bet",
-#             "2025-06-15",
-#             "https://example.com/resolution",
-#             "Invalid Bet",
-#             "Bet with single outcome",
-#             ["Only Option"],
-#         ]
-#     )
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_place_bet_success():
-#     """Test successful bet placement by user"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create a bet first
-#     contract.create_bet(
-#         args=[
-#             "place_bet_test",
-#             "2025-06-15",
-#             "https://example.com/resolution",
-#             "Place Bet Test",
-#             "Test placing bets",
-#             ["Option A", "Option B", "Option C"],
-#         ]
-#     )
-
-#     # Place a bet
-#     place_bet_result = contract.place_bet(
-#         args=["place_bet_test", 1]
-#     )  # Betting on "Option B"
-#     assert tx_execution_succeeded(place_bet_result)
-
-#     # Verify bet was placed
-#     bets = contract.get_bets(args=[])
-#     bet = bets[0]
-#     assert default_account.address in bet["users_bets"]
-#     assert bet["users_bets"][default_account.address] == 1
-
-
-# def test_place_bet_invalid_bet_id_fails():
-#     """Test that placing bet on non-existent bet fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Try to place bet on non-existent bet
-#     tx_receipt = contract.place_bet(args=["non_existent_bet", 0])
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_place_bet_invalid_outcome_index_fails():
-#     """Test that placing bet with invalid outcome index fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create a bet with 2 outcomes
-#     contract.create_bet(
-#         args=[
-#             "invalid_index_test",
-#             "2025-06-15",
-#             "https://example.com/resolution",
-#             "Invalid Index Test",
-#             "Test invalid outcome index",
-#             ["Yes", "No"],
-#         ]
-#     )
-
-#     # Try to place bet with invalid outcome index (2, when only 0 and 1 are valid)
-#     tx_receipt = contract.place_bet(args=["invalid_index_test", 2])
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_place_bet_duplicate_fails():
-#     """Test that placing multiple bets by same user on same event fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create a bet
-#     contract.create_bet(
-#         args=[
-#             "duplicate_place_test",
-#             "2025-06-15",
-#             "https://example.com/resolution",
-#             "Duplicate Place Test",
-#             "Test duplicate bet placement",
-#             ["Option A", "Option B"],
-#         ]
-#     )
-
-#     # Place first bet
-#     contract.place_bet(args=["duplicate_place_test", 0])
-
-#     # Try to place second bet - should fail
-#     tx_receipt = contract.place_bet(args=["duplicate_place_test", 1])
-#     tx_execution_failed(tx_receipt)
+def create_example_bets(contract, prefix, description, count=3):
+    """Creates open bets `<prefix>_0` to `<prefix>_<count - 1>` on an example URL"""
+    title = prefix.replace("_", " ").title()
+    for i in range(count):
+        contract.create_bet(
+            args=[
+                f"{prefix}_{i}",
+                "2030-07-10",
+                "https://example.com/resolution",
+                "",
+                "",
+                f"{title} {i}",
+                description,
+                "Community",
+            ]
+        )
 
 
 def test_resolve_bet_success_correct_prediction():
@@ -218,153 +80,397 @@ def test_resolve_bet_success_correct_prediction():
     assert player_points >= 0
 
 
-# def test_resolve_bet_invalid_bet_id_fails():
-#     """Test that resolving non-existent bet fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Try to resolve non-existent bet
-#     tx_receipt = contract.resolve_bet(args=["non_existent_bet"])
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_resolve_bet_already_resolved_fails():
-#     """Test that resolving already resolved bet fails"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create and resolve a bet
-#     contract.create_bet(
-#         args=[
-#             "already_resolved_test",
-#             "2024-06-15",  # Past date
-#             "https://example.com/resolution",
-#             "Already Resolved Test",
-#             "Test already resolved bet",
-#             ["Yes", "No"],
-#         ]
-#     )
-
-#     # Resolve the bet first time
-#     contract.resolve_bet(
-#         args=["already_resolved_test"],
-#         wait_interval=10000,
-#         wait_retries=15,
-#     )
-
-#     # Try to resolve again - should fail
-#     tx_receipt = contract.resolve_bet(args=["already_resolved_test"])
-#     tx_execution_failed(tx_receipt)
-
-
-# def test_get_points_empty():
-#     """Test getting points when no bets resolved"""
-#     contract = load_fixture(deploy_contract)
-
-#     points = contract.get_points(args=[])
-#     assert points == {}
-
-
-# def test_get_player_points_no_points():
-#     """Test getting player points when player has no points"""
-#     contract = load_fixture(deploy_contract)
-
-#     player_points = contract.get_player_points(args=[default_account.address])
-#     assert player_points == 0
-
-
-# def test_ai_model_bet_scenario():
-#     """Test the AI model betting scenario"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create AI model bet
-#     contract.create_bet(
-#         args=[
-#             "new_ai_model_surpass_o3",
-#             "2025-06-20",  # Future date to allow bet placement
-#             "https://openai.com/research/",
-#             "New AI Model Surpassing OpenAI's o3",
-#             "Will any provider release an AI model with more than 70 Artificial Intelligence before June 20, surpassing OpenAI's o3 model?",
-#             ["Yes", "No"],
-#         ]
-#     )
-
-#     # Place a bet on "Yes"
-#     contract.place_bet(args=["new_ai_model_surpass_o3", 0])
-
-#     # Verify bet placement
-#     bets = contract.get_bets(args=[])
-#     assert len(bets) == 1
-#     assert bets[0]["id"] == "new_ai_model_surpass_o3"
-#     assert default_account.address in bets[0]["users_bets"]
-#     assert bets[0]["users_bets"][default_account.address] == 0
-
-
-# def test_genlayer_ama_bet_scenario():
-#     """Test the GenLayer AMA betting scenario"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create GenLayer AMA bet
-#     contract.create_bet(
-#         args=[
-#             "genlayer_ama_340_members",
-#             "2025-06-30",  # Future date to allow bet placement
-#             "https://x.com/Cryptony09",
-#             "Genlayer AMA Membership Milestone",
-#             "Will one Genlayer AMA surpass more than 340 members according to @Cryptony09's post from X?",
-#             ["Yes", "No"],
-#         ]
-#     )
-
-#     # Place a bet on "No"
-#     contract.place_bet(args=["genlayer_ama_340_members", 1])
-
-#     # Verify bet placement
-#     bets = contract.get_bets(args=[])
-#     assert len(bets) == 1
-#     assert bets[0]["id"] == "genlayer_ama_340_members"
-#     assert default_account.address in bets[0]["users_bets"]
-#     assert bets[0]["users_bets"][default_account.address] == 1
-
-
-# def test_multiple_bets_and_users():
-#     """Test scenario with multiple bets and multiple users"""
-#     contract = load_fixture(deploy_contract)
-
-#     # Create multiple bets
-#     contract.create_bet(
-#         args=[
-#             "bet_1",
-#             "2025-06-15",
-#             "https://example.com/bet1",
-#             "First Bet",
-#             "First betting event",
-#             ["A", "B"],
-#         ]
-#     )
-
-#     contract.create_bet(
-#         args=[
-#             "bet_2",
-#             "2025-06-16",
-#             "https://example.com/bet2",
-#             "Second Bet",
-#             "Second betting event",
-#             ["X", "Y", "Z"],
-#         ]
-#     )
-
-#     # Place bets
-#     contract.place_bet(args=["bet_1", 0])  # Bet on A
-#     contract.place_bet(args=["bet_2", 2])  # Bet on Z
-
-#     # Verify multiple bets exist
-#     bets = contract.get_bets(args=[])
-#     assert len(bets) == 2
-
-#     # Verify user has placed bets on both
-#     bet_1 = next(bet for bet in bets if bet["id"] == "bet_1")
-#     bet_2 = next(bet for bet in bets if bet["id"] == "bet_2")
-
-#     assert default_account.address in bet_1["users_bets"]
-#     assert default_account.address in bet_2["users_bets"]
-#     assert bet_1["users_bets"][default_account.address] == 0
-#     assert bet_2["users_bets"][default_account.address] == 2
+def test_get_bet_by_id():
+    """Test reading a single bet through the bet id index"""
+    contract = load_fixture(deploy_contract)
+
+    contract.create_bet(
+        args=[
+            "indexed_bet",
+            "2025-07-10",
+            "https://example.com/resolution",
+            "",
+            "",
+            "Indexed Bet",
+            "Test reading one bet by id",
+            "Community",
+        ]
+    )
+
+    bet = contract.get_bet(args=["indexed_bet"])
+    assert bet["id"] == "indexed_bet"
+    assert bet["title"] == "Indexed Bet"
+    assert bet["has_resolved"] == False
+
+    # Duplicate ids are rejected through the index
+    tx_receipt = contract.create_bet(
+        args=[
+            "indexed_bet",
+            "2025-07-11",
+            "https://example.com/resolution2",
+            "",
+            "",
+            "Indexed Bet Again",
+            "Duplicate id",
+            "Community",
+        ]
+    )
+    assert tx_execution_failed(tx_receipt)
+
+
+def test_get_bets_summary_and_participants():
+    """Test the metadata-only and paginated bet views"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "summary_bet", "Test the summary view")
+    contract.place_bets(args=["discord_user", "x_user", "yes", "no", "yes"])
+
+    summary = contract.get_bets_summary(args=[])
+    assert [bet["id"] for bet in summary] == [
+        "summary_bet_0",
+        "summary_bet_1",
+        "summary_bet_2",
+    ]
+    assert "users_bets" not in summary[0]
+
+    page = contract.get_bet_participants(args=["summary_bet_1", 0, 10])
+    assert page["users_bets"] == {default_account.address: "no"}
+    assert page["total_players"] == 1
+    assert page["next_offset"] is None
+
+
+def test_place_bets_v2_packed_outcomes():
+    """Test placing picks on any number of markets with one outcome string"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "packed_bet", "Test packed outcomes", count=4)
+
+    # Wrong length and invalid characters are rejected
+    assert tx_execution_failed(contract.place_bets_v2(args=["discord", "x", "yn"]))
+    assert tx_execution_failed(contract.place_bets_v2(args=["discord", "x", "ynxy"]))
+
+    assert tx_execution_succeeded(
+        contract.place_bets_v2(args=["discord", "x", "yn-Y"])
+    )
+
+    user_bets = contract.get_all_user_bets(args=[])
+    selections = user_bets["user_bet_selections"][default_account.address]
+    assert [(s["bet_id"], s["selected_outcome"]) for s in selections] == [
+        ("packed_bet_0", "yes"),
+        ("packed_bet_1", "no"),
+        ("packed_bet_3", "yes"),
+    ]
+
+
+def test_get_leaderboard_and_rank():
+    """Test the ranked leaderboard views before any bet is resolved"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "ranked_bet", "Test the leaderboard")
+
+    # Unregistered players have no rank
+    assert contract.get_rank(args=[default_account.address]) == {
+        "rank": 0,
+        "stale": False,
+    }
+
+    contract.place_bets(args=["discord_user", "x_user", "yes", "yes", "no"])
+
+    leaderboard = contract.get_leaderboard(args=[0, 10])
+    assert leaderboard["entries"] == [
+        {"address": default_account.address, "points": 0, "rank": 1}
+    ]
+    assert leaderboard["total_players"] == 1
+    assert leaderboard["next_offset"] is None
+    assert not leaderboard["stale"]
+    assert contract.get_rank(args=[default_account.address]) == {
+        "rank": 1,
+        "stale": False,
+    }
+
+
+def test_resolve_bets_rejects_invalid_batches():
+    """Test that batch resolution validates every bet before any consensus round"""
+    contract = load_fixture(deploy_contract)
+
+    contract.create_bet(
+        args=[
+            "future_bet",
+            "2999-01-01",
+            "https://example.com/resolution",
+            "",
+            "",
+            "Future Bet",
+            "A bet that cannot be resolved yet",
+            "Community",
+        ]
+    )
+
+    assert tx_execution_failed(contract.resolve_bets(args=[[]]))
+    assert tx_execution_failed(contract.resolve_bets(args=[["non_existent_bet"]]))
+    assert tx_execution_failed(contract.resolve_bets(args=[["future_bet"]]))
+
+
+def test_set_bet_rule_validation():
+    """Test that deterministic resolution rules are validated"""
+    contract = load_fixture(deploy_contract)
+
+    contract.create_bet(
+        args=[
+            "rule_bet",
+            "2025-07-10",
+            "",
+            "get_tweet_data",
+            "1935668887577632966",
+            "More than 700 likes",
+            "Will the video reach more than 700 likes?",
+            "Community",
+        ]
+    )
+
+    assert tx_execution_succeeded(
+        contract.set_bet_rule(
+            args=["rule_bet", "data.public_metrics.like_count", ">", "700"]
+        )
+    )
+    assert tx_execution_failed(
+        contract.set_bet_rule(
+            args=["rule_bet", "data.public_metrics.like_count", "=>", "700"]
+        )
+    )
+    assert tx_execution_failed(
+        contract.set_bet_rule(
+            args=["rule_bet", "data.public_metrics.like_count", ">", "many"]
+        )
+    )
+
+
+def test_create_bet_invalid_date_and_resolvable_bets():
+    """Test date validation at creation and the due date index"""
+    contract = load_fixture(deploy_contract)
+
+    # Malformed dates fail at creation time
+    tx_receipt = contract.create_bet(
+        args=[
+            "malformed_date_bet",
+            "10/07/2025",
+            "https://example.com/resolution",
+            "",
+            "",
+            "Malformed Date",
+            "Test date validation",
+            "Community",
+        ]
+    )
+    assert tx_execution_failed(tx_receipt)
+
+    for bet_id, resolution_date in [
+        ("later_bet", "2025-07-10"),
+        ("future_bet", "2999-01-01"),
+        ("earlier_bet", "2025-06-01"),
+    ]:
+        contract.create_bet(
+            args=[
+                bet_id,
+                resolution_date,
+                "https://example.com/resolution",
+                "",
+                "",
+                "Due Date Bet",
+                "Test the due date index",
+                "Community",
+            ]
+        )
+
+    # 2026-01-01T00:00:00Z
+    resolvable_bets = contract.get_resolvable_bets(args=[1767225600, 10])
+    assert resolvable_bets == ["earlier_bet", "later_bet"]
+    assert contract.get_bet(args=["later_bet"])["resolution_date"] == "2025-07-10"
+
+
+def test_get_changes_since():
+    """Test the incremental change feed"""
+    contract = load_fixture(deploy_contract)
+
+    assert contract.get_changes_since(args=[0, 10]) == {
+        "changes": [],
+        "latest_seq": 0,
+        "complete": True,
+    }
+
+    create_example_bets(contract, "feed_bet", "Test the change feed")
+    contract.place_bets(args=["discord_user", "x_user", "yes", "no", "yes"])
+
+    feed = contract.get_changes_since(args=[0, 10])
+    assert feed["latest_seq"] == 4
+    assert [(change["kind"], change["subject"]) for change in feed["changes"]] == [
+        ("bet_created", "feed_bet_0"),
+        ("bet_created", "feed_bet_1"),
+        ("bet_created", "feed_bet_2"),
+        ("player_registered", default_account.address),
+    ]
+
+    # Only the changes after the given sequence number are returned
+    feed = contract.get_changes_since(args=[3, 10])
+    assert [change["seq"] for change in feed["changes"]] == [4]
+
+
+def test_get_user_bets():
+    """Test reading a single player's handles, picks and points"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "user_bet", "Test the per-address view")
+
+    assert contract.get_user_bets(args=[default_account.address]) is None
+
+    contract.place_bets(args=["discord_user", "x_user", "yes", "no", "yes"])
+
+    user_bets = contract.get_user_bets(args=[default_account.address])
+    assert user_bets["discord_handler"] == "discord_user"
+    assert user_bets["x_handler"] == "x_user"
+    assert user_bets["points"] == 0
+    assert [
+        (selection["bet_id"], selection["selected_outcome"], selection["is_correct"])
+        for selection in user_bets["bet_selections"]
+    ] == [
+        ("user_bet_0", "yes", None),
+        ("user_bet_1", "no", None),
+        ("user_bet_2", "yes", None),
+    ]
+
+
+def test_get_player_by_handle():
+    """Test looking up players by normalized Discord and X handles"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "handle_bet", "Test the handle indexes")
+
+    assert contract.get_player_by_handle(args=["discord", "Discord_User"]) is None
+
+    contract.place_bets(args=["Discord_User", "@X_User", "yes", "no", "yes"])
+
+    address = contract.get_player_by_handle(args=["discord", " discord_user "])
+    assert address.lower() == default_account.address.lower()
+    address = contract.get_player_by_handle(args=["x", "x_user"])
+    assert address.lower() == default_account.address.lower()
+    assert contract.get_player_by_handle(args=["x", "discord_user"]) is None
+
+
+def test_get_state_chunk():
+    """Test streaming the state in chunks and verifying the digest"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "chunk_bet", "Test the state chunks")
+    contract.place_bets(args=["discord_user", "x_user", "yes", "no", "yes"])
+
+    bets, players, digest = [], [], 0
+    cursor = 0
+    while cursor is not None:
+        chunk = contract.get_state_chunk(args=[cursor, 2])
+        bets.extend(chunk["bets"])
+        players.extend(chunk["players"])
+        digest += int(chunk["chunk_digest"], 16)
+        cursor = chunk["next_cursor"]
+
+    assert chunk["total_items"] == 4
+    assert [bet[0] for bet in bets] == ["chunk_bet_0", "chunk_bet_1", "chunk_bet_2"]
+    assert players[0][0].lower() == default_account.address.lower()
+    assert players[0][1:3] == ["discord_user", "x_user"]
+    assert digest % 2**256 == int(chunk["state_digest"], 16)
+
+
+def test_create_bets_batch():
+    """Test creating several bets in one transaction"""
+    contract = load_fixture(deploy_contract)
+
+    batch = [
+        {
+            "bet_id": f"batch_bet_{i}",
+            "resolution_date": "2025-07-10",
+            "resolution_url": "https://example.com/resolution",
+            "title": f"Batch Bet {i}",
+            "description": "Test creating bets in batch",
+            "category": "Community",
+        }
+        for i in range(3)
+    ]
+    assert tx_execution_succeeded(contract.create_bets(args=[json.dumps(batch), False]))
+    assert [bet["id"] for bet in contract.get_bets(args=[])] == [
+        "batch_bet_0",
+        "batch_bet_1",
+        "batch_bet_2",
+    ]
+
+    # A duplicate aborts the whole batch
+    repeated = [dict(batch[0], bet_id="batch_bet_3"), batch[1]]
+    assert tx_execution_failed(contract.create_bets(args=[json.dumps(repeated), False]))
+    assert len(contract.get_bets(args=[])) == 3
+
+    # Unless invalid entries are skipped
+    assert tx_execution_succeeded(
+        contract.create_bets(args=[json.dumps(repeated), True])
+    )
+    assert len(contract.get_bets(args=[])) == 4
+
+
+def test_import_user_bets():
+    """Test registering off-chain players in one owner transaction"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "import_bet", "Test importing players")
+
+    player_1 = "0x" + "11" * 20
+    player_2 = "0x" + "22" * 20
+    records = [
+        [player_1, "discord_1", "x_1", "yny"],
+        [player_2, "discord_2", "x_2", "n-y"],
+    ]
+    # A repeated address aborts the whole batch
+    assert tx_execution_failed(
+        contract.import_user_bets(args=[records + [records[0]], False])
+    )
+    assert contract.get_user_bets(args=[player_1]) is None
+
+    assert tx_execution_succeeded(contract.import_user_bets(args=[records, False]))
+    assert contract.get_user_bets(args=[player_1])["discord_handler"] == "discord_1"
+    # Skipped bets are left out of the selections
+    selections = contract.get_user_bets(args=[player_2])["bet_selections"]
+    assert [(s["bet_id"], s["selected_outcome"]) for s in selections] == [
+        ("import_bet_0", "no"),
+        ("import_bet_2", "yes"),
+    ]
+
+
+def test_get_metrics():
+    """Test the persistent write method counters"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(contract, "metrics_bet", "Test the metrics")
+    contract.place_bets(args=["discord_user", "x_user", "yes", "no", "yes"])
+
+    metrics = contract.get_metrics(args=[])
+    assert metrics["counters"]["create_bet.calls"] == 3
+    assert metrics["counters"]["bets_created"] == 3
+    assert metrics["counters"]["place_bets.calls"] == 1
+    assert metrics["counters"]["players_registered"] == 1
+    assert metrics["gauges"]["bets"] == 3
+    assert metrics["gauges"]["players"] == 1
+
+
+def test_set_bet_resolution_mode_validation():
+    """Test that only known resolution modes can be selected"""
+    contract = load_fixture(deploy_contract)
+
+    create_example_bets(
+        contract, "evidence_bet", "Test the evidence resolution mode", count=1
+    )
+
+    assert tx_execution_succeeded(
+        contract.set_bet_resolution_mode(args=["evidence_bet_0", "evidence"])
+    )
+    assert tx_execution_failed(
+        contract.set_bet_resolution_mode(args=["evidence_bet_0", "vote"])
+    )
+    assert tx_execution_failed(
+        contract.set_bet_resolution_mode(args=["non_existent_bet", "prompt"])
+    )
@@ -0,0 +1,571 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from bench import genlayer_sim
+from bench.cassette import Cassette
+
+contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+
+CASSETTE_PATH = Path(__file__).parent / "cassettes" / "genlayer_bets.json"
+OWNER = "0x00000000000000000000000000000000000000aa"
+PLAYER = "0x00000000000000000000000000000000000000bb"
+FIFA_URL = "https://www.fifa.com/en/match-centre/match/520/288301/288302/400017744?date=2025-06-04"
+# Markets dated 2025-06-04 take picks at OPEN_TIME and resolve at CLOSED_TIME
+OPEN_TIME = 1748736000  # 2025-06-01
+CLOSED_TIME = 1749081600  # 2025-06-05
+
+
+@pytest.fixture
+def contract():
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(OPEN_TIME)
+    with Cassette(CASSETTE_PATH).install(contracts):
+        yield contracts.GenLayerBets()
+
+
+def create_bet(
+    contract,
+    bet_id,
+    resolution_date="2025-06-04",
+    url=FIFA_URL,
+    x_method="",
+    x_parameter="",
+    title="Football match between Barbados and Aruba",
+    description="Will the match between Barbados and Aruba end in a draw?",
+):
+    genlayer_sim.set_sender(OWNER)
+    contract.create_bet(
+        bet_id,
+        resolution_date,
+        url,
+        x_method,
+        x_parameter,
+        title,
+        description,
+        "Football",
+    )
+
+
+def test_create_bet_success(contract):
+    """Test successful bet creation by owner"""
+    create_bet(contract, "test_bet_1")
+
+    bets = contract.get_bets()
+    assert len(bets) == 1
+    assert bets[0]["id"] == "test_bet_1"
+    assert bets[0]["title"] == "Football match between Barbados and Aruba"
+    assert bets[0]["has_resolved"] == False
+    assert bets[0]["resolution_date"] == "2025-06-04"
+
+
+def test_create_bet_duplicate_id_fails(contract):
+    """Test that creating a bet with duplicate ID fails"""
+    create_bet(contract, "duplicate_bet")
+
+    with pytest.raises(Exception, match="already exists"):
+        create_bet(contract, "duplicate_bet", "2025-06-16")
+
+
+@pytest.mark.parametrize("resolution_date", ["2025-13-01", "1969-12-31"])
+def test_create_bet_invalid_date_fails(contract, resolution_date):
+    """Test that malformed and pre-1970 resolution dates are rejected"""
+    with pytest.raises(Exception, match="Invalid resolution date"):
+        create_bet(contract, "dated_bet", resolution_date)
+    assert contract.get_bets() == []
+
+
+def test_create_bet_by_non_owner_fails(contract):
+    """Test that only the owner can create bets"""
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception, match="Only the contract owner"):
+        contract.create_bet(
+            "player_bet", "2025-06-15", FIFA_URL, "", "", "Bet", "Bet", "Football"
+        )
+
+
+def test_place_bet_success(contract):
+    """Test successful bet placement by user"""
+    create_bet(contract, "place_bet_test")
+
+    genlayer_sim.set_sender(PLAYER)
+    contract.place_bets_v2("discord_user", "x_user", "n")
+
+    bet = contract.get_bets()[0]
+    assert bet["users_bets"] == {PLAYER: "no"}
+
+
+def test_place_bet_invalid_outcome_fails(contract):
+    """Test that placing a bet with an invalid outcome fails"""
+    create_bet(contract, "invalid_outcome_test")
+
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception):
+        contract.place_bets_v2("discord_user", "x_user", "x")
+
+
+def test_place_bet_duplicate_fails(contract):
+    """Test that placing bets twice from the same address fails"""
+    create_bet(contract, "duplicate_place_test")
+
+    genlayer_sim.set_sender(PLAYER)
+    contract.place_bets_v2("discord_user", "x_user", "y")
+    with pytest.raises(Exception, match="already registered a bet"):
+        contract.place_bets_v2("discord_user", "x_user", "n")
+
+
+def test_resolve_bet_success_correct_prediction(contract):
+    """Test successful bet resolution with correct user prediction"""
+    create_bet(contract, "test_bet_1")
+
+    genlayer_sim.set_sender(PLAYER)
+    contract.place_bets_v2("discord_user", "x_user", "y")  # Betting on a draw
+
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("test_bet_1")
+
+    bet = contract.get_bets()[0]
+    assert bet["has_resolved"] == True
+    assert bet["outcome"] == "yes"
+    assert bet["reason"] != ""
+    assert contract.get_player_points(PLAYER) == 1
+
+
+def test_resolve_bet_invalid_bet_id_fails(contract):
+    """Test that resolving non-existent bet fails"""
+    with pytest.raises(Exception, match="not found"):
+        contract.resolve_bet("non_existent_bet")
+
+
+def test_resolve_bet_already_resolved_fails(contract):
+    """Test that resolving already resolved bet fails"""
+    create_bet(contract, "already_resolved_test")
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("already_resolved_test")
+
+    with pytest.raises(Exception, match="already resolved"):
+        contract.resolve_bet("already_resolved_test")
+
+
+def test_get_points_empty(contract):
+    """Test getting points when no bets resolved"""
+    assert contract.get_points() == {}
+
+
+def test_get_player_points_no_points(contract):
+    """Test getting player points when player has no points"""
+    assert contract.get_player_points(PLAYER) == 0
+
+
+def test_x_bet_scenario(contract):
+    """Test resolving bets from X, by prompt and by rule"""
+    create_bet(
+        contract,
+        "genlayer_tweets_testnet",
+        url="",
+        x_method="get_user_latest_tweets",
+        x_parameter="GenLayer",
+        title="GenLayer testnet announcement",
+        description="Will GenLayer tweet about its testnet launch?",
+    )
+    create_bet(
+        contract,
+        "testnet_announcement_video_likes",
+        url="",
+        x_method="get_tweet_data",
+        x_parameter="1929584755478069444",
+        title="Testnet announcement video likes",
+        description="Will the testnet announcement video get more than 700 likes?",
+    )
+    contract.set_bet_rule(
+        "testnet_announcement_video_likes",
+        "data.public_metrics.like_count",
+        ">",
+        "700",
+    )
+
+    genlayer_sim.set_sender(PLAYER)
+    contract.place_bets_v2("discord_user", "x_user", "yn")
+
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bets(
+        ["genlayer_tweets_testnet", "testnet_announcement_video_likes"]
+    )
+
+    first, second = contract.get_bets()
+    assert first["outcome"] == "yes"
+    assert second["outcome"] == "yes"
+    assert second["reason"] == "data.public_metrics.like_count is 812, > 700"
+    assert contract.get_player_points(PLAYER) == 1
+
+
+def test_state_chunks_match_state_digest(contract):
+    """Test that chunk digests add up to the state digest after changes"""
+    create_bet(contract, "test_bet_1")
+    for i in range(5):
+        genlayer_sim.set_sender(hex(0x100 + i))
+        contract.place_bets_v2(f"discord_{i}", f"x_{i}", "y" if i % 2 else "n")
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("test_bet_1")
+
+    chunks = [contract.get_state_chunk(cursor, 2) for cursor in (0, 2, 4)]
+
+    assert [chunk["next_cursor"] for chunk in chunks] == [2, 4, None]
+    assert chunks[0]["bets"][0][:3] == ["test_bet_1", 1748995200, True]
+    assert sum(len(chunk["players"]) for chunk in chunks) == 5
+    digest = sum(int(chunk["chunk_digest"], 16) for chunk in chunks)
+    assert digest % 2**256 == int(chunks[-1]["state_digest"], 16)
+
+
+def test_create_bets_reports_invalid_entries(contract):
+    """Test that skipped batch entries are reported with their position"""
+    create_bet(contract, "test_bet_1")
+    batch = [
+        {"bet_id": "new_bet", "resolution_date": "2025-07-10", "title": "New"},
+        {"bet_id": "test_bet_1", "resolution_date": "2025-07-10", "title": "Old"},
+        {"bet_id": "late_bet", "resolution_date": "2025-13-01", "title": "Late"},
+        {"bet_id": "new_bet", "resolution_date": "2025-07-10", "title": "Again"},
+    ]
+    for entry in batch:
+        entry["description"] = "Batch bet"
+
+    with pytest.raises(Exception, match="Invalid bet at position 1"):
+        contract.create_bets(json.dumps(batch))
+    assert len(contract.get_bets()) == 1
+
+    result = contract.create_bets(json.dumps(batch), True)
+
+    assert result["created"] == ["new_bet"]
+    assert [error["position"] for error in result["errors"]] == [1, 2, 3]
+    assert "already exists" in result["errors"][0]["error"]
+    assert "repeated in the batch" in result["errors"][2]["error"]
+    assert [bet["id"] for bet in contract.get_bets()] == ["test_bet_1", "new_bet"]
+
+
+def test_import_user_bets_reports_invalid_records(contract):
+    """Test that imported records follow the place_bets_v2 rules"""
+    create_bet(contract, "test_bet_1")
+    genlayer_sim.set_sender(PLAYER)
+    contract.place_bets_v2("discord_user", "x_user", "y")
+    genlayer_sim.set_sender(OWNER)
+
+    records = [
+        ["0x" + "11" * 20, "discord_1", "x_1", "n"],
+        [PLAYER, "discord_2", "x_2", "y"],
+        ["0x" + "22" * 20, "@Discord_1", "x_3", "y"],
+        ["0x" + "33" * 20, "discord_4", "x_4", "maybe"],
+        "abcd",
+    ]
+    with pytest.raises(Exception, match="Invalid record at position 1"):
+        contract.import_user_bets(records)
+    assert contract.get_user_bets("0x" + "11" * 20) is None
+
+    result = contract.import_user_bets(records, True)
+
+    assert result["imported"] == 1
+    assert [error["position"] for error in result["errors"]] == [1, 2, 3, 4]
+    assert "Record must be" in result["errors"][3]["error"]
+    assert contract.get_player_by_handle("discord", "DISCORD_1") == "0x" + "11" * 20
+
+
+def test_resolution_metrics_and_bounded_logs(contract, capsys):
+    """Test the resolution counters and that logged values are size-bounded"""
+    create_bet(contract, "test_bet_1")
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("test_bet_1")
+
+    counters = contract.get_metrics()["counters"]
+    assert counters["resolve_bet.calls"] == 1
+    assert counters["bets_resolved"] == 1
+    assert counters["bets_resolved_by_prompt"] == 1
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [event["event"] for event in events] == [
+        "bet_classified",
+        "prompt_timings",
+        "prompt_verdicts",
+    ]
+    assert set(events[1]) >= {"fetch_ms", "prompt_build_ms", "llm_ms", "parse_ms"}
+    for event in events:
+        for value in event.values():
+            if isinstance(value, str):
+                assert len(value) <= contracts.LOG_VALUE_LIMIT + 20
+
+
+def test_evidence_mode_resolution(contract):
+    """Test that evidence bets are resolved with the leader's quoted excerpt"""
+    create_bet(contract, "test_bet_1")
+    with pytest.raises(Exception, match="Invalid resolution mode"):
+        contract.set_bet_resolution_mode("test_bet_1", "vote")
+    contract.set_bet_resolution_mode("test_bet_1", "evidence")
+
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception, match="Only the contract owner"):
+        contract.set_bet_resolution_mode("test_bet_1", "prompt")
+    contract.place_bets_v2("discord_user", "x_user", "y")
+
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("test_bet_1")
+
+    bet = contract.get_bets()[0]
+    assert bet["outcome"] == "yes"
+    assert 'Evidence: "Barbados 2 - 2 Aruba Full time"' in bet["reason"]
+    assert contract.get_player_points(PLAYER) == 1
+    assert contract.get_metrics()["counters"]["bets_resolved_by_evidence"] == 1
+    with pytest.raises(Exception, match="already resolved"):
+        contract.set_bet_resolution_mode("test_bet_1", "prompt")
+
+
+def test_check_evidence_rejects_unquoted_excerpts():
+    """Test that validators reject evidence that is not quoted from the source"""
+    source = {"id": "bet", "title": "Match", "description": "Draw?"}
+    content = "Barbados 2 - 2 Aruba\nFull time"
+    genlayer_sim.reset()
+    genlayer_sim.set_prompt_handler(lambda prompt: "Yes.")
+
+    verdict = {"outcome": "yes", "reason": "Draw", "evidence": "2 - 2 ARUBA full time"}
+    assert contracts._check_evidence(source, content, verdict)
+    for changes in (
+        {"evidence": "Barbados 3 - 2 Aruba"},
+        {"evidence": " "},
+        {"evidence": "Aruba " * 100},
+        {"outcome": "draw"},
+    ):
+        assert not contracts._check_evidence(source, content, {**verdict, **changes})
+
+
+def test_closed_markets_reject_picks(contract):
+    """Test that markets past their resolution date no longer take picks"""
+    create_bet(contract, "open_bet", resolution_date="2025-07-10")
+    create_bet(contract, "closed_bet", resolution_date="2025-05-01")
+
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception, match="Bet closed_bet is closed"):
+        contract.place_bets_v2("discord_user", "x_user", "yy")
+    contract.place_bets_v2("discord_user", "x_user", "y-")
+
+    genlayer_sim.set_sender(OWNER)
+    result = contract.import_user_bets(
+        [
+            ["0x" + "11" * 20, "discord_1", "x_1", "-n"],
+            ["0x" + "22" * 20, "discord_2", "x_2", "n-"],
+        ],
+        True,
+    )
+    assert result["imported"] == 1
+    assert "closed_bet is closed" in result["errors"][0]["error"]
+
+
+def test_leaderboard_follows_resolutions():
+    """Test that leaderboard pages and ranks match the points after each resolution"""
+    url = "https://example.com/resolution"
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(OPEN_TIME)
+    genlayer_sim.set_webpage(url, "It happened")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "%s", "reason": "It happened"}'
+        % ("yes" if "Yes market" in prompt else "no")
+    )
+    contract = contracts.GenLayerBets()
+    for i in range(4):
+        title = "Yes market" if i % 2 == 0 else "No market"
+        contract.create_bet(
+            f"bet_{i}", "2025-06-04", url, "", "", title, f"Market {i}", "Community"
+        )
+    rng = random.Random(0)
+    players = [hex(0x100 + i) for i in range(30)]
+    for i, player in enumerate(players):
+        genlayer_sim.set_sender(player)
+        outcomes = rng.choice("yn") + "".join(rng.choice("yn-") for _ in range(3))
+        contract.place_bets_v2(f"discord_{i}", f"x_{i}", outcomes)
+
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    for i in range(4):
+        contract.resolve_bet(f"bet_{i}")
+        assert contract.get_leaderboard(0, 7)["stale"]
+        assert contract.get_rank(players[0])["stale"]
+        while contract.apply_scores(f"bet_{i}", 7) > 0:
+            assert contract.get_leaderboard(0, 7)["stale"]
+        with pytest.raises(Exception, match="already applied"):
+            contract.apply_scores(f"bet_{i}", 7)
+
+        points = {
+            contracts.Address(player).as_hex: contract.get_player_points(player)
+            for player in players
+        }
+        entries = []
+        offset = 0
+        while offset is not None:
+            page = contract.get_leaderboard(offset, 7)
+            entries.extend(page["entries"])
+            offset = page["next_offset"]
+            assert not page["stale"]
+
+        assert {entry["address"]: entry["points"] for entry in entries} == points
+        assert [entry["points"] for entry in entries] == sorted(
+            points.values(), reverse=True
+        )
+        for entry in entries:
+            rank = 1 + sum(other > entry["points"] for other in points.values())
+            assert entry["rank"] == rank
+            assert contract.get_rank(entry["address"]) == {"rank": rank, "stale": False}
+
+
+def test_apply_scores_reaches_players_registered_midway():
+    """Test that players registering while a bet is applied are scored once"""
+    url = "https://example.com/resolution"
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(OPEN_TIME)
+    genlayer_sim.set_webpage(url, "It happened")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "It happened"}'
+    )
+    contract = contracts.GenLayerBets()
+    contract.create_bet("early", "2025-06-04", url, "", "", "Early", "Early", "Community")
+    contract.create_bet("late", "2025-07-04", url, "", "", "Late", "Late", "Community")
+    for i in range(3):
+        genlayer_sim.set_sender(hex(0x100 + i))
+        contract.place_bets_v2(f"discord_{i}", f"x_{i}", "yy")
+
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    contract.resolve_bet("early")
+    assert contract.get_metrics()["gauges"]["pending_scores"] == 1
+    with pytest.raises(Exception, match="no scores to apply"):
+        contract.apply_scores("late", 2)
+    assert contract.apply_scores("early", 2) == 1
+
+    # Registering after the bet closed, the player only picks the late bet
+    genlayer_sim.set_sender(hex(0x200))
+    contract.place_bets_v2("discord_late", "x_late", "-y")
+    genlayer_sim.set_sender(OWNER)
+    assert contract.apply_scores("early", 2) == 0
+
+    page = contract.get_leaderboard(0, 10)
+    assert not page["stale"]
+    assert [entry["points"] for entry in page["entries"]] == [1, 1, 1, 0]
+    assert page["entries"][3]["address"] == contracts.Address(hex(0x200)).as_hex
+
+    metrics = contract.get_metrics()
+    assert metrics["counters"]["apply_scores.players_scanned"] == 4
+    assert metrics["counters"]["apply_scores.players_moved"] == 3
+    assert metrics["gauges"]["pending_scores"] == 0
+
+
+def test_resolve_bets_fetches_equivalent_urls_once(monkeypatch):
+    """Test that bets whose URLs only differ in form share a single fetch"""
+    urls = [
+        "https://Example.com/match?b=2&a=1",
+        "https://example.COM/match?a=1&b=2#score",
+        "https://example.com/match?a=1&b=2",
+    ]
+    fetched = []
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(CLOSED_TIME)
+    monkeypatch.setattr(
+        genlayer_sim.gl,
+        "get_webpage",
+        lambda url, mode="text": fetched.append(url) or "It happened",
+    )
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "It happened"}'
+    )
+    contract = contracts.GenLayerBets()
+    for i, url in enumerate(urls):
+        contract.create_bet(
+            f"bet_{i}", "2025-06-04", url, "", "", f"Bet {i}", "Same source", "Community"
+        )
+
+    contract.resolve_bets(["bet_0", "bet_1", "bet_2"])
+
+    assert fetched == [urls[0]]
+    assert len({contracts.normalize_url(url) for url in urls}) == 1
+    assert [bet["outcome"] for bet in contract.get_bets_summary()] == ["yes"] * 3
+
+
+def test_trim_content_keeps_relevant_windows_within_budget():
+    """Test that trimmed content fits the budget and keeps the keyword windows"""
+    window = contracts.CONTENT_WINDOW_SIZE
+    filler = ("Lorem ipsum dolor sit amet " * 40)[:window]
+    match = ("Barbados drew 2 - 2 with Aruba " * 40)[:window]
+    content = filler * 5 + match + filler * 5 + match[::-1]
+
+    for budget in (window, 2 * window, 3 * window + 500):
+        trimmed = contracts.trim_content(
+            content, "Will Barbados and Aruba draw?", budget
+        )
+        assert len(trimmed) <= budget
+        assert match in trimmed.split(contracts.CONTENT_WINDOW_SEPARATOR)
+    assert contracts.trim_content(content, "Barbados", len(content)) == content
+
+
+def test_set_bet_content_budget_bounds(contract):
+    """Test that content budgets stay between one window and the maximum"""
+    create_bet(contract, "test_bet_1")
+
+    for budget in (contracts.CONTENT_WINDOW_SIZE - 1, contracts.MAX_CONTENT_BUDGET + 1):
+        with pytest.raises(Exception, match="Content budget must be between"):
+            contract.set_bet_content_budget("test_bet_1", budget)
+    with pytest.raises(Exception, match="not found"):
+        contract.set_bet_content_budget("non_existent_bet", 2000)
+
+    contract.set_bet_content_budget("test_bet_1", contracts.MAX_CONTENT_BUDGET)
+    assert contract.bets[0].content_budget == contracts.MAX_CONTENT_BUDGET
+
+
+def test_project_x_payload_keeps_resolution_fields():
+    """Test that X payloads are cut down to the fields markets resolve from"""
+    tweet = {
+        "id": "1",
+        "text": "Testnet is live",
+        "public_metrics": {"like_count": 812},
+        "edit_history_tweet_ids": ["1"],
+        "entities": {"urls": []},
+    }
+    payload = {
+        "data": [tweet],
+        "includes": {"users": [{"id": "2"}]},
+        "meta": {"result_count": 1},
+        "errors": [{"title": "Partial", "detail": "Missing user", "type": "about:blank"}],
+    }
+
+    assert contracts.project_x_payload(payload) == {
+        "data": [
+            {"id": "1", "text": "Testnet is live", "public_metrics": {"like_count": 812}}
+        ],
+        "errors": [{"title": "Partial", "detail": "Missing user"}],
+    }
+    assert contracts.project_x_payload({"data": tweet})["data"]["id"] == "1"
+    # Bodies that are not X API objects pass through unchanged
+    for body in ([tweet], "rate limited", None, {"message": "Not found"}):
+        assert contracts.project_x_payload(body) == body
+
+
+def test_place_bets_rejects_late_picks(contract):
+    """Test that the legacy place_bets takes no picks on closed or resolved bets"""
+    for i in range(3):
+        create_bet(contract, f"bet_{i}")
+    genlayer_sim.set_time(CLOSED_TIME)
+
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception, match="Bet bet_0 is closed"):
+        contract.place_bets("discord_user", "x_user", "yes", "yes", "yes")
+
+    genlayer_sim.set_sender(OWNER)
+    contract.resolve_bets(["bet_0", "bet_1", "bet_2"])
+    genlayer_sim.set_sender(PLAYER)
+    with pytest.raises(Exception, match="Bet bet_0 is already resolved"):
+        contract.place_bets("discord_user", "x_user", "yes", "yes", "yes")
+    assert contract.get_player_points(PLAYER) == 0
+    assert contract.get_rank(PLAYER)["rank"] == 0
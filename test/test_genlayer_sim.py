@@ -0,0 +1,48 @@
+from bench import genlayer_sim
+from bench.benchmark_contract import run_benchmark
+
+contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+
+
+def test_simulator_counts_storage_ops():
+    genlayer_sim.reset()
+    contract = contracts.GenLayerBets()
+    contract.create_bet(
+        "sim_bet",
+        "2025-01-01",
+        "https://example.com/resolution",
+        "",
+        "",
+        "Sim Bet",
+        "Test the simulator",
+        "Community",
+    )
+
+    genlayer_sim.stats.reset()
+    bet = contract.get_bet("sim_bet")
+    assert bet["id"] == "sim_bet"
+    assert genlayer_sim.stats.reads > 0
+    assert genlayer_sim.stats.writes == 0
+
+    genlayer_sim.set_webpage("https://example.com/resolution", "It happened")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "It happened"}'
+    )
+    genlayer_sim.stats.reset()
+    contract.resolve_bet("sim_bet")
+    assert genlayer_sim.stats.writes > 0
+    assert contract.get_bet("sim_bet")["outcome"] == "yes"
+
+
+def test_benchmark_reports_every_method():
+    results = run_benchmark(contracts, players=20)
+
+    assert {result["method"] for result in results} >= {
+        "get_bets",
+        "get_all_user_bets",
+        "resolve_bet",
+    }
+    for result in results:
+        assert result["players"] == 20
+        assert result["seconds"] >= 0
+        assert result["response_bytes"] > 0
@@ -0,0 +1,107 @@
+import sqlite3
+
+from bench import genlayer_sim
+from services.indexer import Indexer, SQLiteMirror
+
+contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+
+OWNER = "0x00000000000000000000000000000000000000aa"
+URL = "https://example.com/resolution"
+# bet_2 closes first, the other markets stay open after it resolves
+RESOLUTION_DATES = ("2025-02-01", "2025-02-01", "2025-01-01")
+OPEN_TIME = 1733011200  # 2024-12-01
+BET_2_CLOSED_TIME = 1736899200  # 2025-01-15
+
+
+class SimulatedGateway:
+    """
+    Serves the contract views straight from a simulated contract
+    """
+
+    def __init__(self, contract):
+        self.contract = contract
+        self.chunk_calls = 0
+
+    def get_state_chunk(self, cursor, max_items):
+        self.chunk_calls += 1
+        return self.contract.get_state_chunk(cursor, max_items)
+
+
+def make_contract(players):
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(OPEN_TIME)
+    genlayer_sim.set_webpage(URL, "It happened")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "It happened"}'
+    )
+    contract = contracts.GenLayerBets()
+    for i, resolution_date in enumerate(RESOLUTION_DATES):
+        contract.create_bet(
+            f"bet_{i}", resolution_date, URL, "", "", f"Bet {i}", "Bet", "Community"
+        )
+    for i in range(players):
+        genlayer_sim.set_sender(hex(0x1000 + i))
+        contract.place_bets_v2(f"discord_{i}", f"x_{i}", "yn-" if i % 2 else "nny")
+    genlayer_sim.set_sender(OWNER)
+    return contract
+
+
+def make_indexer(contract, chunk_size=50):
+    connection = sqlite3.connect(":memory:")
+    return Indexer(SimulatedGateway(contract), SQLiteMirror(connection), chunk_size)
+
+
+def count(indexer, table):
+    query = f'SELECT COUNT(*) FROM "{table}"'
+    return indexer.mirror.connection.execute(query).fetchone()[0]
+
+
+def test_initial_sync_mirrors_bets_users_and_user_bets():
+    contract = make_contract(players=1000)
+    indexer = make_indexer(contract)
+
+    stats = indexer.sync_once()
+
+    assert stats.verified
+    assert (stats.bets, stats.users, stats.user_bets) == (3, 1000, 2500)
+    assert indexer.gateway.chunk_calls == 21
+    assert count(indexer, "Bet") == 3
+    assert count(indexer, "User") == 1000
+    assert count(indexer, "UserBet") == 2500
+    user = indexer.mirror.connection.execute(
+        'SELECT "discordHandle", "xHandle", "points" FROM "User" WHERE "address" = ?',
+        (hex(0x1001).replace("0x", "0x" + "0" * 36),),
+    ).fetchone()
+    assert user == ("discord_1", "x_1", 0)
+
+
+def test_sync_skips_unchanged_state_and_upserts_only_changes():
+    contract = make_contract(players=200)
+    indexer = make_indexer(contract)
+    indexer.sync_once()
+
+    assert indexer.sync_once().skipped
+
+    genlayer_sim.set_time(BET_2_CLOSED_TIME)
+    contract.resolve_bet("bet_2")
+    genlayer_sim.set_sender(hex(0x9999))
+    contract.place_bets_v2("discord_new", "x_new", "-y-")
+    stats = indexer.sync_once()
+
+    # Only bet_2, the 100 players who picked it and the new player changed
+    assert stats.verified
+    assert (stats.bets, stats.users) == (1, 101)
+    assert stats.user_bets == 100 * 3 + 1
+    assert stats.unchanged == 2 + 100
+    points = dict(
+        indexer.mirror.connection.execute(
+            'SELECT "points", COUNT(*) FROM "User" GROUP BY "points"'
+        )
+    )
+    assert points == {0: 101, 1: 100}
+    resolved = indexer.mirror.connection.execute(
+        'SELECT "resolved", "resolvedOutcome" FROM "Bet" WHERE "betId" = ?',
+        ("bet_2",),
+    ).fetchone()
+    assert resolved == (1, "yes")
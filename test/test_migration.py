@@ -0,0 +1,172 @@
+import pytest
+
+from bench import genlayer_sim
+from services.migration import migrate, migration_records
+
+contracts = genlayer_sim.load_contract("contracts.genlayer_bets")
+
+OWNER = "0x00000000000000000000000000000000000000aa"
+URL = "https://example.com/resolution"
+# bet_0 and bet_1 are closed and resolved on the source, bet_2 still takes picks
+SOURCE_BETS = [
+    ("bet_0", "2025-01-01", True, "yes"),
+    ("bet_1", "2025-01-15", True, "no"),
+    ("bet_2", "2025-07-01", False, ""),
+]
+MIGRATION_TIME = 1738368000  # 2025-02-01
+SUCCESS = {"consensus_data": {"leader_receipt": {"execution_result": "SUCCESS"}}}
+
+
+class SourceExport:
+    """
+    Serves the `get_bets` and `get_all_user_bets` views of a previous
+    deployment, with the picks stored as the "yes" and "no" strings it took
+    """
+
+    def __init__(self, picks):
+        self.picks = picks
+
+    def get_bets(self):
+        return [
+            {
+                "id": bet_id,
+                "resolution_date": resolution_date,
+                "has_resolved": has_resolved,
+                "resolution_url": URL,
+                "resolution_x_method": "",
+                "resolution_x_parameter": "",
+                "title": f"Market {bet_id}",
+                "description": "Migrated market",
+                "category": "Football",
+                "outcome": outcome,
+                "reason": "It happened" if has_resolved else "",
+            }
+            for bet_id, resolution_date, has_resolved, outcome in SOURCE_BETS
+        ]
+
+    def get_all_user_bets(self):
+        return {
+            "user_addresses": list(self.picks),
+            "user_handlers": {
+                address: {"x_handler": f"x_{i}", "discord_handler": f"discord_{i}"}
+                for i, address in enumerate(self.picks)
+            },
+            "user_bet_selections": {
+                address: [
+                    {"bet_id": bet_id, "bet_title": "", "selected_outcome": pick}
+                    for (bet_id, *_), pick in zip(SOURCE_BETS, picks)
+                ]
+                for address, picks in self.picks.items()
+            },
+            "total_users": len(self.picks),
+        }
+
+
+class SimulatedTarget:
+    """
+    Runs the migration writes straight on a simulated contract
+    """
+
+    def __init__(self, contract):
+        self.contract = contract
+        self.calls = []
+
+    def create_bets(self, bets_json):
+        return self._write("create_bets", bets_json, False)
+
+    def migrate_resolutions(self, resolutions):
+        return self._write("migrate_resolutions", resolutions)
+
+    def migrate_user_bets(self, records):
+        return self._write("migrate_user_bets", records)
+
+    def wait_for_transaction(self, transaction_hash):
+        return SUCCESS
+
+    def _write(self, function_name, *args):
+        self.calls.append(function_name)
+        getattr(self.contract, function_name)(*args)
+        return hex(len(self.calls))
+
+
+def source_picks(players):
+    picks = ("Yes", "no")
+    return {
+        hex(0x1000 + i): [picks[i % 2], picks[i // 2 % 2], picks[i // 4 % 2]]
+        for i in range(players)
+    }
+
+
+def make_target():
+    genlayer_sim.reset()
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(MIGRATION_TIME)
+    genlayer_sim.set_webpage(URL, "It happened")
+    genlayer_sim.set_prompt_handler(
+        lambda prompt: '{"outcome": "yes", "reason": "It happened"}'
+    )
+    return contracts.GenLayerBets()
+
+
+def test_migration_keeps_points_of_closed_markets():
+    """Test that points earned on the source carry over, ranked and final"""
+    source = SourceExport(source_picks(8))
+    contract = make_target()
+    target = SimulatedTarget(contract)
+
+    summary = migrate(source, target, batch_size=3)
+
+    assert summary == {"bets": 3, "resolutions": 2, "players": 8}
+    assert target.calls == ["create_bets", "migrate_resolutions"] + [
+        "migrate_user_bets"
+    ] * 3
+    expected = {}
+    for address, picks in source.picks.items():
+        points = (picks[0] == "Yes") + (picks[1] == "no")
+        if points:
+            expected[contracts.Address(address).as_hex] = points
+    assert contract.get_points() == expected
+    page = contract.get_leaderboard(0, 10)
+    assert not page["stale"]
+    assert {entry["address"]: entry["points"] for entry in page["entries"]} == {
+        contracts.Address(address).as_hex: expected.get(
+            contracts.Address(address).as_hex, 0
+        )
+        for address in source.picks
+    }
+
+    # Open markets keep taking picks and the season goes on
+    genlayer_sim.set_sender(hex(0x2000))
+    contract.place_bets_v2("discord_new", "x_new", "--y")
+    genlayer_sim.set_sender(OWNER)
+    genlayer_sim.set_time(1751414400)  # 2025-07-02
+    contract.resolve_bet("bet_2")
+    assert contract.apply_scores("bet_2", 100) == 0
+    assert contract.get_player_points(hex(0x2000)) == 1
+
+
+def test_finished_migration_rejects_migration_writes():
+    """Test that closed and resolved picks are only taken while migrating"""
+    contract = make_target()
+    migrate(SourceExport(source_picks(2)), SimulatedTarget(contract), batch_size=10)
+    record = [hex(0x3000), "discord_late", "x_late", "yny"]
+
+    with pytest.raises(Exception, match="Bet bet_0 is already resolved"):
+        contract.import_user_bets([record])
+    genlayer_sim.set_sender(hex(0x3000))
+    with pytest.raises(Exception, match="Only the contract owner"):
+        contract.migrate_user_bets([record])
+    genlayer_sim.set_sender(OWNER)
+
+    contract.finish_migration()
+    with pytest.raises(Exception, match="Migration is finished"):
+        contract.migrate_user_bets([record])
+    with pytest.raises(Exception, match="Migration is finished"):
+        contract.migrate_resolutions([["bet_2", "yes", "Too late"]])
+
+
+def test_migration_records_reject_unknown_picks():
+    """Test that source picks other than yes and no are reported"""
+    source = SourceExport({hex(0x1000): ["yes", "maybe", "no"]})
+    with pytest.raises(ValueError, match="Unexpected pick maybe"):
+        migration_records(source.get_bets(), source.get_all_user_bets())
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+
+import eth_utils
+import rlp
+from eth_abi import decode as abi_decode
+from eth_account import Account
+from genlayer_py import create_client
+from genlayer_py.abi import calldata
+from genlayer_py.chains import localnet
+
+from services.gateway import ContractGateway
+from services.resolution_scheduler import Backoff, ResolutionScheduler
+
+CONTRACT_ADDRESS = "0x" + "22" * 20
+ADD_TRANSACTION_ABI = {
+    "type": "function",
+    "name": "addTransaction",
+    "inputs": [
+        {"name": "_sender", "type": "address"},
+        {"name": "_recipient", "type": "address"},
+        {"name": "_numOfInitialValidators", "type": "uint256"},
+        {"name": "_maxRotations", "type": "uint256"},
+        {"name": "_txData", "type": "bytes"},
+    ],
+    "outputs": [],
+    "stateMutability": "nonpayable",
+}
+
+
+class FakeGenLayerRPC:
+    """
+    Minimal GenLayer JSON-RPC endpoint serving the GenLayerBets methods used by
+    the scheduler. Transactions stay PENDING for `pending_polls` receipt polls,
+    then `failing_bets` end UNDETERMINED and `reverting_bets` are FINALIZED
+    with a failed execution. Reused nonces are rejected like on a real node.
+    """
+
+    def __init__(self, due_bets, pending_polls=2, failing_bets=(), reverting_bets=()):
+        self.due_bets = list(due_bets)
+        self.pending_polls = pending_polls
+        self.failing_bets = set(failing_bets)
+        self.reverting_bets = set(reverting_bets)
+        self.resolved = []
+        self.submissions = []
+        self.transactions = {}
+        self.max_in_flight = 0
+        self.lock = Lock()
+
+    def handle(self, method, params):
+        if method == "sim_getConsensusContract":
+            return {"address": "0x" + "11" * 20, "abi": [ADD_TRANSACTION_ABI]}
+        if method == "eth_getTransactionCount":
+            return hex(len(self.submissions))
+        if method == "eth_call":
+            call = calldata.decode(eth_utils.decode_hex(params[0]["data"]))
+            assert call["method"] == "get_resolvable_bets"
+            _, limit = call["args"]
+            due = [bet for bet in self.due_bets if bet not in self.resolved]
+            return eth_utils.encode_hex(calldata.encode(due[:limit]))
+        if method == "eth_sendRawTransaction":
+            return self._submit(eth_utils.decode_hex(params[0]))
+        if method == "eth_getTransactionByHash":
+            return self._poll(params[0])
+        raise ValueError(f"Unexpected method {method}")
+
+    def _submit(self, raw_transaction):
+        fields = rlp.decode(raw_transaction)
+        nonce = int.from_bytes(fields[0], "big")
+        if nonce != len(self.submissions):
+            raise ValueError(f"Nonce {nonce} was already used")
+        _, _, _, _, tx_data = abi_decode(
+            ["address", "address", "uint256", "uint256", "bytes"], fields[5][4:]
+        )
+        call = calldata.decode(rlp.decode(tx_data)[0])
+        assert call["method"] == "resolve_bet"
+        transaction_hash = eth_utils.encode_hex(eth_utils.keccak(raw_transaction))
+        self.submissions.append(call["args"][0])
+        self.transactions[transaction_hash] = {
+            "bet_id": call["args"][0],
+            "polls": 0,
+        }
+        in_flight = sum(
+            1
+            for transaction in self.transactions.values()
+            if transaction["polls"] <= self.pending_polls
+        )
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+        return transaction_hash
+
+    def _poll(self, transaction_hash):
+        transaction = self.transactions[transaction_hash]
+        transaction["polls"] += 1
+        result = {"hash": transaction_hash, "status": "FINALIZED"}
+        if transaction["polls"] <= self.pending_polls:
+            result["status"] = "PENDING"
+        elif transaction["bet_id"] in self.failing_bets:
+            result["status"] = "UNDETERMINED"
+        elif transaction["bet_id"] in self.reverting_bets:
+            result["consensus_data"] = {"leader_receipt": {"execution_result": "ERROR"}}
+        else:
+            result["consensus_data"] = {
+                "leader_receipt": {"execution_result": "SUCCESS"}
+            }
+            if transaction["bet_id"] not in self.resolved:
+                self.resolved.append(transaction["bet_id"])
+        return result
+
+    def serve(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                request = json.loads(self.rfile.read(length))
+                response = {"jsonrpc": "2.0", "id": request["id"]}
+                try:
+                    with fake.lock:
+                        response["result"] = fake.handle(
+                            request["method"], request["params"]
+                        )
+                except ValueError as error:
+                    response["error"] = {"code": -32000, "message": str(error)}
+                body = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def make_scheduler(fake, concurrency=2):
+    server = fake.serve()
+    localnet.consensus_main_contract = None
+    client = create_client(
+        chain=localnet,
+        endpoint=f"http://127.0.0.1:{server.server_port}/api",
+        account=Account.create(),
+    )
+    scheduler = ResolutionScheduler(
+        ContractGateway(client, CONTRACT_ADDRESS),
+        concurrency=concurrency,
+        batch_limit=10,
+        receipt_timeout=5,
+        backoff=Backoff(initial=0.01, maximum=0.05),
+        rng=random.Random(0),
+    )
+    return server, scheduler
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    backoff = Backoff(initial=1.0, factor=2.0, maximum=10.0, jitter=0.5)
+    rng = random.Random(0)
+    for attempt, ceiling in enumerate([1.0, 2.0, 4.0, 8.0, 10.0, 10.0]):
+        delay = backoff.delay(attempt, rng)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+def test_scheduler_resolves_due_bets_once():
+    fake = FakeGenLayerRPC(["bet_a", "bet_b", "bet_c", "bet_d", "bet_e"])
+    server, scheduler = make_scheduler(fake, concurrency=4)
+
+    async def run():
+        queued = await scheduler.poll_once()
+        # Pending bets are not queued twice
+        assert await scheduler.poll_once() == []
+        await scheduler.drain()
+        return queued
+
+    try:
+        queued = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert queued == ["bet_a", "bet_b", "bet_c", "bet_d", "bet_e"]
+    assert sorted(fake.submissions) == queued
+    assert sorted(fake.resolved) == queued
+    # Submissions are serialized, receipts are still awaited concurrently
+    assert 1 < fake.max_in_flight <= 4
+    metrics = scheduler.metrics.snapshot()
+    assert metrics["submitted"] == 5
+    assert metrics["succeeded"] == 5
+    assert metrics["failed"] == 0
+    assert metrics["queue_depth"] == 0
+
+
+def test_scheduler_requeues_failed_resolutions():
+    fake = FakeGenLayerRPC(["bet_a", "bet_b"], failing_bets={"bet_b"})
+    server, scheduler = make_scheduler(fake)
+
+    async def run():
+        await scheduler.poll_once()
+        await scheduler.drain()
+        # The failed bet is still due and gets queued again
+        return await scheduler.poll_once()
+
+    try:
+        requeued = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert requeued == ["bet_b"]
+    assert scheduler.metrics.succeeded == 1
+    assert scheduler.metrics.failed == 1
+
+
+def test_scheduler_counts_failed_executions_as_failed():
+    fake = FakeGenLayerRPC(["bet_a", "bet_b"], reverting_bets={"bet_b"})
+    server, scheduler = make_scheduler(fake)
+
+    async def run():
+        await scheduler.poll_once()
+        await scheduler.drain()
+        return await scheduler.poll_once()
+
+    try:
+        requeued = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    # The transaction was finalized but the contract call failed
+    assert requeued == ["bet_b"]
+    assert scheduler.metrics.succeeded == 1
+    assert scheduler.metrics.failed == 1